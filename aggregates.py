@@ -0,0 +1,56 @@
+import pandas as pd
+
+from data_loader import COUNT_COLUMNS, FLAG_PREFIX
+
+
+def flag_columns(data):
+    return [column for column in data.columns if column.startswith(FLAG_PREFIX)]
+
+
+# Name of the cube column counting the rows where a flag was answered (non-null)
+def answered_column(flag):
+    return f"{flag} (answered)"
+
+
+# Name of the cube column holding an area's percentage share of a count column
+def share_column(column):
+    return f"{column} (%)"
+
+
+# Additive per-area aggregates: count sums, row counts and existence-flag tallies
+def partial_cube(data):
+    flags = flag_columns(data)
+    grouped = data.groupby('refArea', observed=True)
+    partial = grouped[COUNT_COLUMNS + ['Total'] + flags].sum()
+    partial['Rows'] = grouped.size()
+    answered = grouped[flags].count()
+    answered.columns = [answered_column(flag) for flag in flags]
+    return pd.concat([partial, answered], axis=1)
+
+
+# Fold several partial cubes (e.g. from different chunks or files) into one
+def merge_partials(partials):
+    return pd.concat(partials).groupby(level=0).sum()
+
+
+# Add the non-additive columns (percentage shares) and turn 'refArea' back into a plain string column
+def finalize_cube(partial):
+    cube = partial.copy()
+    totals = cube[COUNT_COLUMNS].sum()
+    for column in COUNT_COLUMNS:
+        cube[share_column(column)] = cube[column] / totals[column] * 100
+    cube.index = cube.index.astype(str)
+    cube.index.name = 'refArea'
+    return cube.reset_index()
+
+
+# Build the per-area cube every chart page reads from
+def build_cube(data):
+    return finalize_cube(partial_cube(data))
+
+
+# Number of rows per flag value, as value_counts() on the raw column would report it
+def flag_counts(cube, flag):
+    exists = cube[flag].sum()
+    counts = pd.Series({0: cube[answered_column(flag)].sum() - exists, 1: exists}, name='count')
+    return counts[counts > 0].sort_values(ascending=False)
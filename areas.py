@@ -0,0 +1,91 @@
+import re
+import unicodedata
+
+# Static reference data about the areas in the dataset
+
+# Define coordinates for different areas
+coordinates = {
+    'Akkar_Governorate': (34.5078, 36.1534),
+    'Mount_Lebanon_Governorate': (33.9634, 35.8347),
+    'Matn_District': (34.0280, 35.8351),
+    'Byblos_District': (34.1202, 35.6800),
+    'Baalbek-Hermel_Governorate': (33.9061, 36.1478),
+    'Aley_District': (33.8321, 35.8329),
+    'Keserwan_District': (34.0376, 35.6163),
+    'Tyre_District': (33.1615, 35.1146),
+    'South_Governorate': (33.2721, 35.2033),
+    'Sidon_District': (33.6020, 35.6924),
+    'Baabda_District': (33.8750, 35.4778),
+    'Miniyeh–Danniyeh_District': (34.2755, 35.7016),
+    'North_Governorate': (34.4186, 35.7857),
+    'Zgharta_District': (34.1564, 35.7830),
+    'Nabatieh_Governorate': (33.3641, 35.6466),
+    'Bint_Jbeil_District': (33.3638, 35.7387),
+    'Batroun_District': (34.1755, 35.7016),
+    'Zahlé_District': (33.5422, 35.8101),
+    'Western_Beqaa_District': (34.2304, 35.8682),
+    'Marjeyoun_District': (33.7500, 35.6924),
+    'Beqaa_Governorate': (34.0868, 35.9783),
+    'Bsharri_District': (34.2507, 36.0117),
+    'Hasbaya_District': (33.3979, 35.6851),
+    'Hermel_District': (34.3989, 36.3904),
+    'Tripoli_District,_Lebanon': (34.3284, 35.9783)
+}
+
+# Example recommendations for different districts (customize these as needed)
+recommendations = {
+    'Akkar_Governorate': ["Akkar Plains", "Mkaibeh Village", "Akkar Castle"],
+    'Aley_District': ["Aley Souks", "Beirut River Valley", "Aley Forest"],
+    'Baabda_District': ["Baabda Palace", "Chouf Cedars", "Deir el Qamar"],
+    'Baalbek-Hermel_Governorate': ["Baalbek Ruins", "Zahle", "Qasr el Heri"],
+    'Batroun_District': ["Batroun Old Town", "Roman Baths", "Batroun Beaches"],
+    'Beqaa_Governorate': ["Anjar Ruins", "Baalbek Temples", "Karaoun Lake"],
+    'Bint_Jbeil_District': ["Bint Jbeil Heritage", "Mleeta Resistance Museum", "Tyre Beach"],
+    'Bsharri_District': ["Qadisha Valley", "Cedars of God", "Bsharri Museum"],
+    'Byblos_District': ["Byblos Castle", "Old Souk", "Jeita Grotto"],
+    'Hasbaya_District': ["Hasbaya Castle", "Hasbaya Souk", "Ras El Ain"],
+    'Hermel_District': ["Hermel Ruins", "Lebanon River", "Mount Hermon"],
+    'Keserwan_District': ["Jounieh Bay", "Harissa", "Faqra Ruins"],
+    'Marjeyoun_District': ["Marjeyoun Castle", "Ajloun Nature Reserve", "The Ruins of Qasr el-Ma"],
+    'Matn_District': ["Broummana", "Jdita Village", "Matn Souk"],
+    'Miniyeh–Danniyeh_District': ["Miniyeh Old Town", "Danniyeh Mountains", "Saint Georges Monastery"],
+    'Mount_Lebanon_Governorate': ["Jounieh Bay", "Harissa", "Faqra Ruins"],
+    'Nabatieh_Governorate': ["Nabatieh Souk", "Berkayel", "Jezzine Waterfalls"],
+    'North_Governorate': ["Tripoli Citadel", "Abou Ali River", "El Mina"],
+    'Sidon_District': ["Sidon Sea Castle", "Ancient Sidon", "Sidon Souks"],
+    'South_Governorate': ["Tyre Roman Ruins", "Jezzine Waterfalls", "Nabatieh Souk"],
+    'Tripoli_District_Lebanon': ["Tripoli Citadel", "Old Tripoli", "Al-Mina Port"],
+    'Tyre_District': ["Tyre Roman Ruins", "Tyre Beach", "Tyre Souks"],
+    'Western_Beqaa_District': ["Baalbek Ruins", "Taanayel Lake", "Shedra"],
+    'Zahlé_District': ["Zahlé River", "Zahlé Cathedral", "Wine Tours"],
+    'Zgharta_District': ["Zgharta Old Town", "Mar Abda Monastery", "Qozhaya Monastery"]
+}
+
+
+# Key used to match area names that only differ in punctuation, case or accents,
+# e.g. 'Tripoli_District,_Lebanon' and 'Tripoli_District_Lebanon'
+def normalize_name(name):
+    text = unicodedata.normalize('NFKD', str(name))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return re.sub(r'[\W_]+', '', text.casefold())
+
+
+_coordinates_by_key = {normalize_name(name): value for name, value in coordinates.items()}
+_recommendations_by_key = {normalize_name(name): value for name, value in recommendations.items()}
+
+
+def lookup_coordinates(name):
+    return _coordinates_by_key.get(normalize_name(name))
+
+
+def lookup_recommendations(name):
+    return _recommendations_by_key.get(normalize_name(name))
+
+
+# Area names with no known coordinates or no recommendations, for reporting
+def unresolved_areas(names):
+    names = sorted(set(map(str, names)))
+    return {
+        'coordinates': [name for name in names if lookup_coordinates(name) is None],
+        'recommendations': [name for name in names if lookup_recommendations(name) is None],
+    }
@@ -0,0 +1,182 @@
+# Local copies of the Overview images in several widths and formats.
+#
+#   python assets.py            # fetch the originals once and build the variants
+#
+# The originals are downloaded once into CACHE_DIR/images. Resized WebP and JPEG variants
+# go to static/images, which Streamlit serves at app/static/images when static serving is
+# enabled (see .streamlit/config.toml). Variant file names contain a hash of the original,
+# so a URL never changes content and browsers can keep and revalidate them. The page
+# then no longer depends on the image hosts: if an original was never fetched, the
+# Overview shows the caption instead until a retry fetches it. See
+# benchmarks/bench_images.py for the bytes transferred and the first image's paint time.
+import hashlib
+import html
+import logging
+import os
+import threading
+import urllib.request
+from collections import namedtuple
+
+import fileio
+import settings
+
+logger = logging.getLogger(__name__)
+
+Image = namedtuple("Image", ["url", "caption"])
+
+IMAGES = {
+    "beirut-skyline": Image(
+        "https://t3.ftcdn.net/jpg/03/87/74/80/360_F_387748004_MxWTt4uHfVVQ59LpqgXHMP4pomczFqQS.jpg",
+        "Beirut Skyline",
+    ),
+    "jeita-grotto": Image(
+        "https://www.new7wonders.com/app/uploads/sites/4/2016/09/16527177602_ff18053a91_o.jpg",
+        "Jeita Grotto",
+    ),
+    "byblos-old-souk": Image(
+        "http://lebanonuntravelled.com/wp/wp-content/uploads/2023/05/photo_5965516417036041360_y-1.jpg",
+        "Byblos Old Souk",
+    ),
+}
+
+# Variant widths in pixels (never wider than the original) and encodings, preferred first
+WIDTHS = (480, 960, 1440)
+FORMATS = {"webp": ("WEBP", "image/webp", 80), "jpg": ("JPEG", "image/jpeg", 82)}
+
+# How wide an image is drawn: the full viewport on small screens, the main column otherwise
+SIZES = "(max-width: 736px) 100vw, 704px"
+
+ORIGINALS_DIR = os.path.join(settings.CACHE_DIR, "images")
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "images")
+STATIC_URL = "app/static/images"
+MANIFEST_NAME = "manifest.json"
+
+# Images whose original could not be fetched are tried again after this many seconds,
+# doubling up to MAX_RETRY_SECONDS
+RETRY_SECONDS = 30
+MAX_RETRY_SECONDS = 3600
+
+
+def read_manifest(static_dir=STATIC_DIR):
+    return fileio.read_json(os.path.join(static_dir, MANIFEST_NAME), {})
+
+
+# Some image hosts refuse requests without a browser-like user agent
+def _download(url):
+    request = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0 (tourism dashboard asset fetcher)"})
+    with urllib.request.urlopen(request, timeout=settings.FETCH_TIMEOUT) as response:
+        return response.read()
+
+
+# Path of the local original, downloading it the first time; None when it is not cached
+# and cannot be fetched
+def fetch_original(name, image, originals_dir=ORIGINALS_DIR, offline=settings.OFFLINE):
+    path = os.path.join(originals_dir, name + os.path.splitext(image.url)[1])
+    if os.path.exists(path):
+        return path
+    if offline:
+        return None
+    try:
+        body = _download(image.url)
+    except OSError as error:
+        logger.warning("Could not fetch %s: %s", image.url, error)
+        return None
+    os.makedirs(originals_dir, exist_ok=True)
+
+    def write(tmp_path):
+        with open(tmp_path, 'wb') as file:
+            file.write(body)
+    fileio.atomic_write(path, write)
+    return path
+
+
+# Resize one original to every width and format; returns its manifest entry
+def build_variants(name, original, static_dir=STATIC_DIR):
+    from PIL import Image as PILImage, ImageOps
+
+    with open(original, 'rb') as file:
+        digest = hashlib.sha256(file.read()).hexdigest()[:10]
+    with PILImage.open(original) as source:
+        picture = ImageOps.exif_transpose(source).convert("RGB")
+
+    widths = sorted({width for width in WIDTHS if width < picture.width} | {min(picture.width, WIDTHS[-1])})
+    entry = {"hash": digest, "width": picture.width, "height": picture.height, "variants": {}}
+    for extension, (encoding, _, quality) in FORMATS.items():
+        variants = []
+        for width in widths:
+            file_name = f"{name}-{width}-{digest}.{extension}"
+            path = os.path.join(static_dir, file_name)
+            if not os.path.exists(path):
+                height = round(picture.height * width / picture.width)
+                resized = picture.resize((width, height), PILImage.LANCZOS)
+                fileio.atomic_write(path, lambda tmp_path: resized.save(tmp_path, encoding, quality=quality, optimize=True))
+            variants.append([width, file_name, os.path.getsize(path)])
+        entry["variants"][extension] = variants
+    return entry
+
+
+# Fetch whatever originals are missing and build their variants; returns the manifest
+def prepare_assets(images=IMAGES, static_dir=STATIC_DIR, originals_dir=ORIGINALS_DIR, offline=settings.OFFLINE):
+    os.makedirs(static_dir, exist_ok=True)
+    manifest = read_manifest(static_dir)
+    for name, image in images.items():
+        original = fetch_original(name, image, originals_dir, offline)
+        if original is None:
+            continue
+        manifest[name] = build_variants(name, original, static_dir)
+    fileio.write_json(os.path.join(static_dir, MANIFEST_NAME), manifest)
+    return manifest
+
+
+# Prepare the assets, then retry the images missing from the manifest with a backoff until
+# every one is available or stop is set; meant to run in a background thread
+def prepare_assets_with_retry(images=IMAGES, static_dir=STATIC_DIR, originals_dir=ORIGINALS_DIR,
+                              offline=settings.OFFLINE, stop=None):
+    stop = stop or threading.Event()
+    retry = RETRY_SECONDS
+    while True:
+        manifest = prepare_assets(images, static_dir, originals_dir, offline)
+        images = {name: image for name, image in images.items() if name not in manifest}
+        # Offline, nothing missing can be fetched
+        if not images or offline:
+            return manifest
+        logger.info("Retrying %s in %d s", ", ".join(images), retry)
+        if stop.wait(retry):
+            return manifest
+        retry = min(retry * 2, MAX_RETRY_SECONDS)
+
+
+def _srcset(variants):
+    return ", ".join(f"{STATIC_URL}/{file_name} {width}w" for width, file_name, _ in variants)
+
+
+# <picture> element letting the browser pick the format it supports and the smallest width
+# that covers its layout; the first image on the page is loaded eagerly, the others lazily
+def picture_html(entry, caption, eager=False):
+    sources = "".join(
+        f'<source type="{FORMATS[extension][1]}" srcset="{_srcset(entry["variants"][extension])}" sizes="{SIZES}">'
+        for extension in FORMATS if extension != "jpg"
+    )
+    fallback = entry["variants"]["jpg"]
+    default = next((variant for variant in fallback if variant[0] >= 960), fallback[-1])
+    loading = 'fetchpriority="high"' if eager else 'loading="lazy"'
+    return (
+        f'<figure style="margin: 0 0 1rem 0"><picture>{sources}'
+        f'<img src="{STATIC_URL}/{default[1]}" srcset="{_srcset(fallback)}" sizes="{SIZES}" '
+        f'width="{entry["width"]}" height="{entry["height"]}" alt="{html.escape(caption)}" {loading} decoding="async" '
+        f'style="width: 100%; height: auto"></picture>'
+        f'<figcaption style="text-align: center; font-size: 0.875rem; opacity: 0.6">{html.escape(caption)}</figcaption></figure>'
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    manifest = prepare_assets()
+    for name, image in IMAGES.items():
+        entry = manifest.get(name)
+        if entry is None:
+            print(f"{name}: not available ({image.url})")
+            continue
+        sizes = ", ".join(f"{extension} " + "/".join(f"{width}px {size // 1024} KiB" for width, _, size in variants)
+                          for extension, variants in entry["variants"].items())
+        print(f"{name}: {entry['width']}x{entry['height']} -> {sizes}")
@@ -0,0 +1,66 @@
+# Submit latency of the feedback store with a large number of stored entries.
+#
+#   python benchmarks/bench_feedback.py --entries 1000000 --submits 2000
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feedback_store import FeedbackStore
+
+
+def fill(store, entries, batch=100_000):
+    conn = store._connection()
+    now = time.time()
+    for start in range(0, entries, batch):
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT INTO feedback (email, feedback, submitted_at) VALUES (?, ?, ?)",
+            ((f"user{i}@example.com", f"feedback number {i}: great", now) for i in range(start, min(start + batch, entries))),
+        )
+        conn.execute("COMMIT")
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return {
+        "p50_ms": statistics.median(samples) * 1000,
+        "p99_ms": samples[int(len(samples) * 0.99) - 1] * 1000,
+        "max_ms": samples[-1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark feedback submit latency")
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--submits", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = FeedbackStore(os.path.join(tmp, "feedback.db"), legacy_path=None)
+        start = time.perf_counter()
+        fill(store, args.entries)
+        print(f"stored {store.count()} entries in {time.perf_counter() - start:.1f}s")
+
+        new, duplicate = [], []
+        for i in range(args.submits):
+            start = time.perf_counter()
+            store.submit(f"new{i}@example.com", "first visit: loved it")
+            new.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            saved, _ = store.submit(f"user{i * 397 % args.entries}@example.com", "again")
+            duplicate.append(time.perf_counter() - start)
+            assert not saved
+
+        for name, samples in (("new submit", new), ("duplicate submit", duplicate)):
+            stats = percentiles(samples)
+            print(f"{name:>16}: " + "  ".join(f"{key}={value:.3f}" for key, value in stats.items()))
+
+
+if __name__ == "__main__":
+    main()
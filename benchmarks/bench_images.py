@@ -0,0 +1,158 @@
+# Bytes transferred and first-image paint time of the Overview images, before (the
+# originals hotlinked from their hosts) and after (the local variants of assets.py).
+#
+#   python benchmarks/bench_images.py --output bench_images.json
+#
+# The variants are built from the cached originals (CACHE_DIR/images), fetching any that
+# are missing; an original that cannot be fetched is replaced by a synthetic photo of
+# --synthetic-size and marked as such. For each viewport the variant is the one a browser
+# picks from the srcset and sizes of assets.picture_html. Paint time is estimated from the
+# first (eagerly loaded) image's bytes on simulated networks, as Lighthouse's simulated
+# throttling does: a hotlinked original needs DNS, TCP and TLS to a new host before its
+# request (4 round trips), a local variant reuses the app's connection (1 round trip).
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import assets
+
+# (viewport width in CSS pixels, device pixel ratio)
+VIEWPORTS = {
+    "phone": (390, 3),
+    "tablet": (768, 2),
+    "laptop": (1366, 1),
+    "desktop-hidpi": (1920, 2),
+}
+
+# (round-trip time in seconds, bandwidth in bits per second)
+NETWORKS = {
+    "slow-4g": (0.150, 1.6e6),
+    "fast-4g": (0.040, 9e6),
+}
+
+
+# Width the image is drawn at for a viewport, following assets.SIZES
+def slot_width(viewport_width):
+    return viewport_width if viewport_width <= 736 else 704
+
+
+# The candidate a browser picks: the narrowest covering the slot at the device pixel
+# ratio, or the widest when none does
+def pick_variant(variants, viewport_width, dpr):
+    needed = slot_width(viewport_width) * dpr
+    return next((variant for variant in variants if variant[0] >= needed), variants[-1])
+
+
+def paint_seconds(size, round_trips, network):
+    rtt, bandwidth = network
+    return round_trips * rtt + size * 8 / bandwidth
+
+
+def synthetic_original(path, size, seed):
+    from PIL import Image as PILImage, ImageFilter
+
+    rng = random.Random(seed)
+    width, height = size
+    noise = PILImage.frombytes("RGB", (width // 4, height // 4), rng.randbytes(width // 4 * height // 4 * 3))
+    picture = noise.resize(size, PILImage.BICUBIC).filter(ImageFilter.GaussianBlur(2))
+    picture.save(path, "JPEG", quality=90)
+
+
+# Originals for every image: the cached or fetched ones, synthetic stand-ins otherwise
+def originals(originals_dir, synthetic_size):
+    paths = {}
+    for seed, (name, image) in enumerate(assets.IMAGES.items()):
+        path = assets.fetch_original(name, image)
+        if path is None:
+            path = os.path.join(originals_dir, f"{name}-synthetic.jpg")
+            synthetic_original(path, synthetic_size, seed)
+        paths[name] = (path, path.endswith("-synthetic.jpg"))
+    return paths
+
+
+def measure(static_dir, originals_dir, synthetic_size):
+    results = []
+    for index, (name, (original, synthetic)) in enumerate(originals(originals_dir, synthetic_size).items()):
+        entry = assets.build_variants(name, original, static_dir)
+        original_bytes = os.path.getsize(original)
+        for viewport, (width, dpr) in VIEWPORTS.items():
+            result = {
+                "image": name,
+                "synthetic": synthetic,
+                "first": index == 0,
+                "viewport": viewport,
+                "original_bytes": original_bytes,
+            }
+            for extension in assets.FORMATS:
+                variant = pick_variant(entry["variants"][extension], width, dpr)
+                result[f"{extension}_width"] = variant[0]
+                result[f"{extension}_bytes"] = variant[2]
+            results.append(result)
+    return results
+
+
+# Bytes per viewport over all images and the first image's estimated paint time
+def summarize(results):
+    summary = {}
+    for viewport in VIEWPORTS:
+        rows = [result for result in results if result["viewport"] == viewport]
+        first = next(result for result in rows if result["first"])
+        summary[viewport] = {
+            "original_bytes": sum(result["original_bytes"] for result in rows),
+            "webp_bytes": sum(result["webp_bytes"] for result in rows),
+            "jpg_bytes": sum(result["jpg_bytes"] for result in rows),
+            "first_paint_s": {
+                network: {
+                    "original": paint_seconds(first["original_bytes"], 4, NETWORKS[network]),
+                    "webp": paint_seconds(first["webp_bytes"], 1, NETWORKS[network]),
+                }
+                for network in NETWORKS
+            },
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the bytes and paint time of the Overview images")
+    parser.add_argument("--synthetic-size", type=int, nargs=2, default=[1920, 1280], metavar=("WIDTH", "HEIGHT"),
+                        help="size of the stand-in for an original that cannot be fetched")
+    parser.add_argument("--output", default="bench_images.json")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = measure(tmp, tmp, tuple(args.synthetic_size))
+    summary = summarize(results)
+
+    if any(result["synthetic"] for result in results):
+        print("some originals could not be fetched; synthetic stand-ins were measured instead", file=sys.stderr)
+    for viewport, totals in summary.items():
+        paints = "  ".join(
+            f"{network} {paint['original']:.2f}s -> {paint['webp']:.2f}s" for network, paint in totals["first_paint_s"].items()
+        )
+        print(
+            f"{viewport:<14} {totals['original_bytes'] // 1024:6d} KiB -> webp {totals['webp_bytes'] // 1024:5d} KiB,"
+            f" jpg {totals['jpg_bytes'] // 1024:5d} KiB   first paint {paints}",
+            file=sys.stderr,
+        )
+
+    with open(args.output, "w") as file:
+        json.dump({
+            "generated_at": time.time(),
+            "python": platform.python_version(),
+            "viewports": VIEWPORTS,
+            "networks": NETWORKS,
+            "results": results,
+            "summary": summary,
+        }, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+# Headless per-page benchmark of tourism_lebanon.py using Streamlit's AppTest.
+#
+# For every sidebar page and dataset scale it records cold render time (empty
+# Streamlit caches and no data snapshot), warm render time (median of reruns),
+# peak Python memory during a cold render, the size of the rendered element
+# payload and the cost of one widget interaction (see INTERACTIONS). Results go
+# to a JSON file and are checked against thresholds.json and, optionally, a
+# previous results file:
+#
+#   python benchmarks/bench_pages.py --scales 1 10 100 1000 --output bench.json
+#   python benchmarks/bench_pages.py --baseline bench.json --output bench-new.json
+#   python benchmarks/bench_pages.py --fragments both   # interactions with and without fragments
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(os.path.dirname(BENCH_DIR), "tourism_lebanon.py")
+THRESHOLDS_PATH = os.path.join(BENCH_DIR, "thresholds.json")
+
+PAGES = ["Overview", "Bar Chart", "Pie Chart", "Heat Map", "Histogram", "Initiatives", "Scatter Plot", "Filtered Map", "Tourist Spots", "Feedback"]
+
+METRICS = ("cold_s", "warm_s", "interact_s", "peak_mb", "payload_kb")
+
+sys.path.insert(0, BENCH_DIR)
+
+import fixtures
+
+
+def click_explanation(at):
+    next(button for button in at.main.button if button.label.startswith("Show")).click()
+
+
+def move_slider(value):
+    return lambda at: at.main.slider[0].set_value(value)
+
+
+# One widget interaction per page and the fragment owning its widget. With fragments
+# (the default) an interaction only reruns that fragment, so the fragment's span is the
+# interaction's cost; with TOURISM_FRAGMENTS=0 it is a whole rerun. AppTest always reruns
+# the whole script, so the fragment cost is read from the app's span logs.
+INTERACTIONS = {
+    "Bar Chart": (lambda at: at.main.selectbox[0].set_value(at.main.selectbox[0].options[-1]), "category_chart"),
+    "Pie Chart": (click_explanation, "explanation"),
+    "Heat Map": (click_explanation, "explanation"),
+    "Histogram": (click_explanation, "explanation"),
+    "Initiatives": (click_explanation, "explanation"),
+    "Scatter Plot": (click_explanation, "explanation"),
+    "Filtered Map": (click_explanation, "explanation"),
+    "Tourist Spots": (move_slider(60), "nearby_areas"),
+    "Feedback": (lambda at: at.text_input[0].set_value("bench@example.com"), "feedback_form"),
+}
+
+
+# Collects the app's span log events (see metrics.Metrics.span)
+class SpanRecorder(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.spans = []
+
+    def emit(self, record):
+        event = json.loads(record.getMessage())
+        if event.get("event") == "span":
+            self.spans.append(event)
+
+    def install(self):
+        logger = logging.getLogger("tourism.metrics")
+        logger.addHandler(self)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        return self
+
+
+# Serialized size of every element the run produced
+def payload_bytes(node):
+    size = 0
+    proto = getattr(node, "proto", None)
+    if proto is not None and hasattr(proto, "ByteSize"):
+        size += proto.ByteSize()
+    for child in getattr(node, "children", {}).values():
+        size += payload_bytes(child)
+    return size
+
+
+def clear_caches(cache_dir):
+    import streamlit as st
+
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def open_page(page, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.run()
+    if page != PAGES[0]:
+        at.sidebar.radio[0].set_value(page)
+    return at
+
+
+def timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return elapsed
+
+
+def measure_interaction(at, page, recorder, runs, fragments):
+    if page not in INTERACTIONS:
+        return None
+    interact, fragment_name = INTERACTIONS[page]
+    times = []
+    for _ in range(runs):
+        interact(at)
+        recorder.spans.clear()
+        elapsed = timed_run(at)
+        if fragments:
+            elapsed = sum(span["seconds"] for span in recorder.spans if span["span"] == f"fragment_{fragment_name}")
+        times.append(elapsed)
+    return statistics.median(times)
+
+
+# Measure every page against the dataset configured in the environment
+def measure_pages(pages, cache_dir, warm_runs, timeout):
+    fragments = os.environ.get("TOURISM_FRAGMENTS", "1") == "1"
+    recorder = SpanRecorder().install()
+    results = []
+    for page in pages:
+        clear_caches(cache_dir)
+        at = open_page(page, timeout)
+        clear_caches(cache_dir)
+        cold = timed_run(at)
+        warm = statistics.median(timed_run(at) for _ in range(warm_runs))
+        payload = payload_bytes(at._tree)
+        interact = measure_interaction(at, page, recorder, warm_runs, fragments)
+
+        clear_caches(cache_dir)
+        tracemalloc.start()
+        timed_run(at)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results.append({
+            "page": page,
+            "cold_s": cold,
+            "warm_s": warm,
+            "interact_s": interact,
+            "fragments": fragments,
+            "peak_mb": peak / 1024 / 1024,
+            "payload_kb": payload / 1024,
+        })
+        interact_text = f"{interact:7.3f}s" if interact is not None else "      -"
+        print(f"  {page:<14} cold {cold:7.3f}s  warm {warm:7.3f}s  interact {interact_text}  peak {peak / 1024 / 1024:7.1f}MB  payload {payload / 1024:8.1f}KB", file=sys.stderr)
+    return results
+
+
+# Each scale runs in its own interpreter so module-level configuration picks up its dataset
+def run_scale(scale, args, tmp, fragments):
+    source = os.path.join(tmp, f"tourism_x{scale}.csv")
+    if scale == 1:
+        shutil.copy(fixtures.FIXTURE_PATH, source)
+    else:
+        fixtures.write_dataset(source, scale)
+    env = dict(
+        os.environ,
+        TOURISM_DATA_URL=source,
+        TOURISM_CACHE_DIR=os.path.join(tmp, f"cache_x{scale}"),
+        TOURISM_FEEDBACK_DB=os.path.join(tmp, "feedback.db"),
+        TOURISM_FRAGMENTS="1" if fragments else "0",
+    )
+    command = [sys.executable, __file__, "--worker", "--warm-runs", str(args.warm_runs), "--timeout", str(args.timeout), "--pages", *args.pages]
+    output = subprocess.run(command, env=env, check=True, stdout=subprocess.PIPE, text=True).stdout
+    with open(source, encoding="utf-8") as file:
+        rows = sum(1 for _ in file) - 1
+    return [dict(result, scale=scale, rows=rows) for result in json.loads(output)]
+
+
+def check(results, thresholds, baseline):
+    failures = []
+    previous = {
+        (entry["scale"], entry["page"], entry.get("fragments", True)): entry for entry in (baseline or {}).get("results", [])
+    }
+    for result in results:
+        limits = dict(thresholds.get("default", {}), **thresholds.get("pages", {}).get(result["page"], {}))
+        for metric, limit in limits.items():
+            if result.get(metric) is not None and result[metric] > limit:
+                failures.append(f"{result['page']} x{result['scale']}: {metric} {result[metric]:.3f} > {limit}")
+        before = previous.get((result["scale"], result["page"], result["fragments"]))
+        if before is None:
+            continue
+        for metric in METRICS:
+            if result.get(metric) is None or before.get(metric) is None:
+                continue
+            allowed = before[metric] * (1 + thresholds.get("max_regression", 0.25))
+            if result[metric] > allowed:
+                failures.append(f"{result['page']} x{result['scale']}: {metric} {result[metric]:.3f} regressed from {before[metric]:.3f}")
+    return failures
+
+
+# Interaction cost per page and scale with and without fragments
+def print_comparison(results):
+    by_mode = {(result["scale"], result["page"], result["fragments"]): result["interact_s"] for result in results}
+    print("interaction cost: whole rerun -> fragment", file=sys.stderr)
+    for (scale, page, fragments), whole in by_mode.items():
+        fragment = by_mode.get((scale, page, True))
+        if fragments or whole is None or fragment is None:
+            continue
+        print(f"  x{scale:<5} {page:<14} {whole:7.3f}s -> {fragment:7.3f}s  ({whole / max(fragment, 1e-6):6.1f}x)", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every dashboard page headlessly")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--pages", nargs="+", default=PAGES)
+    parser.add_argument("--warm-runs", type=int, default=5)
+    parser.add_argument("--fragments", choices=["on", "off", "both"], default="on",
+                        help="run pages with fragment reruns, with whole-script reruns (TOURISM_FRAGMENTS=0), or both")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--thresholds", default=THRESHOLDS_PATH)
+    parser.add_argument("--baseline", help="previous results file to compare against")
+    parser.add_argument("--output", default="bench_pages.json")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        results = measure_pages(args.pages, os.environ["TOURISM_CACHE_DIR"], args.warm_runs, args.timeout)
+        json.dump(results, sys.stdout)
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        modes = {"on": [True], "off": [False], "both": [False, True]}[args.fragments]
+        for scale in args.scales:
+            for fragments in modes:
+                print(f"scale x{scale}, fragments {'on' if fragments else 'off'}", file=sys.stderr)
+                results.extend(run_scale(scale, args, tmp, fragments))
+    if args.fragments == "both":
+        print_comparison(results)
+
+    with open(args.thresholds) as file:
+        thresholds = json.load(file)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    failures = check(results, thresholds, baseline)
+
+    with open(args.output, "w") as file:
+        json.dump({
+            "generated_at": time.time(),
+            "python": platform.python_version(),
+            "thresholds": thresholds,
+            "results": results,
+            "failures": failures,
+        }, file, indent=2)
+
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
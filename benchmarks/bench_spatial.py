@@ -0,0 +1,47 @@
+# Query latency of the spatial index on synthetic town-level points spread over Lebanon.
+#
+#   python benchmarks/bench_spatial.py --points 50000 --queries 2000
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spatial import SpatialIndex
+
+
+def per_query_ms(queries, run):
+    start = time.perf_counter()
+    for lat, lon in queries:
+        run(lat, lon)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark radius and nearest queries of the spatial index")
+    parser.add_argument("--points", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--radius-km", type=float, default=10.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    lats = rng.uniform(33.05, 34.69, args.points)
+    lons = rng.uniform(35.10, 36.62, args.points)
+    totals = rng.integers(0, 400, args.points)
+
+    start = time.perf_counter()
+    index = SpatialIndex(lats, lons)
+    print(f"built index over {args.points} points in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    queries = list(zip(lats[:args.queries], lons[:args.queries]))
+    mask = totals > 300
+    print(f"within {args.radius_km} km: {per_query_ms(queries, lambda lat, lon: index.within(lat, lon, args.radius_km)):.3f} ms/query")
+    print(f"nearest 5: {per_query_ms(queries, lambda lat, lon: index.nearest(lat, lon, 5)):.3f} ms/query")
+    print(f"nearest 5 with total > 300: {per_query_ms(queries, lambda lat, lon: index.nearest(lat, lon, 5, mask=mask)):.3f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# Time-to-first-page of tourism_lebanon.py in fresh interpreters, with the lazy page
+# registry (default) and with every page's imports and data loaded up front
+# (TOURISM_EAGER_IMPORTS=1).
+#
+#   python benchmarks/bench_startup.py --trials 5 --page Overview
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(os.path.dirname(BENCH_DIR), "tourism_lebanon.py")
+
+sys.path.insert(0, BENCH_DIR)
+
+import fixtures
+
+
+def first_page(page):
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    streamlit_ready = time.perf_counter()
+
+    at = AppTest.from_file(APP_PATH, default_timeout=300)
+    at.run()
+    if page != "Overview":
+        at.sidebar.radio[0].set_value(page).run()
+    done = time.perf_counter()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return {
+        "streamlit_import_s": streamlit_ready - start,
+        "first_page_s": done - streamlit_ready,
+        "modules": len(sys.modules),
+    }
+
+
+def trial(page, eager, env):
+    env = dict(env, TOURISM_EAGER_IMPORTS="1" if eager else "0")
+    command = [sys.executable, __file__, "--worker", "--page", page]
+    output = subprocess.run(command, env=env, check=True, stdout=subprocess.PIPE, text=True).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare startup time with and without the page registry")
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--page", default="Overview")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        json.dump(first_page(args.page), sys.stdout)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "tourism.csv")
+        shutil.copy(fixtures.FIXTURE_PATH, source)
+        env = dict(
+            os.environ,
+            TOURISM_DATA_URL=source,
+            TOURISM_CACHE_DIR=os.path.join(tmp, "cache"),
+            TOURISM_FEEDBACK_DB=os.path.join(tmp, "feedback.db"),
+        )
+        # Write the data snapshot first, as a running deployment would already have it
+        trial(args.page, True, env)
+
+        for eager in (False, True):
+            runs = [trial(args.page, eager, env) for _ in range(args.trials)]
+            label = "eager imports" if eager else "page registry"
+            print(
+                f"{label:>14}: first page {statistics.median(run['first_page_s'] for run in runs):.3f}s"
+                f"  (streamlit import {statistics.median(run['streamlit_import_s'] for run in runs):.3f}s,"
+                f" {runs[0]['modules']} modules loaded)"
+            )
+
+
+if __name__ == "__main__":
+    main()
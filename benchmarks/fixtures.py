@@ -0,0 +1,73 @@
+# Synthetic copies of the pkgcube tourism CSV for the benchmarks.
+#
+#   python benchmarks/fixtures.py                  # rewrite fixtures/tourism_sample.csv
+#   python benchmarks/fixtures.py --scale 100 out.csv
+import argparse
+import csv
+import os
+import random
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "tourism_sample.csv")
+
+AREAS = [
+    'Akkar_Governorate', 'Mount_Lebanon_Governorate', 'Matn_District', 'Byblos_District',
+    'Baalbek-Hermel_Governorate', 'Aley_District', 'Keserwan_District', 'Tyre_District',
+    'South_Governorate', 'Sidon_District', 'Baabda_District', 'Miniyeh–Danniyeh_District',
+    'North_Governorate', 'Zgharta_District', 'Nabatieh_Governorate', 'Bint_Jbeil_District',
+    'Batroun_District', 'Zahlé_District', 'Western_Beqaa_District', 'Marjeyoun_District',
+    'Beqaa_Governorate', 'Bsharri_District', 'Hasbaya_District', 'Hermel_District',
+    'Tripoli_District,_Lebanon',
+]
+
+FLAG_COLUMNS = [
+    'Existence of cafes - does not exist',
+    'Existence of restaurants - does not exist',
+    'Existence of hotels - does not exist',
+    'Existence of initiatives and projects in the past five years to improve the tourism sector - exists',
+]
+COUNT_COLUMNS = ['Total number of restaurants', 'Total number of hotels', 'Total number of cafes']
+COLUMNS = ['refArea', 'Town', 'publisher', 'dataset', 'references'] + FLAG_COLUMNS + COUNT_COLUMNS
+
+# Rows per area at scale 1, roughly the size of the published extract
+ROWS_PER_AREA = 40
+
+
+# Yield synthetic rows; scale multiplies the number of towns per area
+def generate_rows(scale=1, seed=0):
+    rng = random.Random(seed)
+    for area in AREAS:
+        for town in range(ROWS_PER_AREA * scale):
+            no_cafes = int(rng.random() < 0.55)
+            no_restaurants = int(rng.random() < 0.55)
+            no_hotels = int(rng.random() < 0.3)
+            yield [
+                f"http://dbpedia.org/resource/{area}",
+                f"{area}_town_{town}",
+                "http://data-gov.lb/publisher/CAS",
+                "http://linked.aub.edu.lb/pkgcube/dataset/tourism",
+                "",
+                no_cafes,
+                no_restaurants,
+                no_hotels,
+                int(rng.random() < 0.12),
+                0 if no_restaurants else rng.randint(1, 12),
+                0 if no_hotels else rng.randint(1, 6),
+                "" if rng.random() < 0.02 else (0 if no_cafes else rng.randint(1, 10)),
+            ]
+
+
+def write_dataset(path, scale=1, seed=0):
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(COLUMNS)
+        writer.writerows(generate_rows(scale, seed))
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic tourism CSV")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("path", nargs="?", default=FIXTURE_PATH)
+    args = parser.parse_args()
+    write_dataset(args.path, args.scale, args.seed)
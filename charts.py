@@ -0,0 +1,96 @@
+import plotly.express as px
+
+import aggregates
+from data_loader import COUNT_COLUMNS
+
+# Figure builders for the chart pages. They only read the per-area cube, so the
+# app can cache their output and other tools can reuse them without Streamlit.
+
+BAR_CATEGORIES = ['Existence of cafes - does not exist', 'Existence of restaurants - does not exist', 'Existence of hotels - does not exist']
+INITIATIVES_COLUMN = 'Existence of initiatives and projects in the past five years to improve the tourism sector - exists'
+
+
+def bar_chart(cube, category):
+    # Count occurrences for the selected category
+    category_count = aggregates.flag_counts(cube, category).reset_index()
+    category_count.columns = ['Existence Status', 'Count']
+
+    # Create a bar plot using Plotly Express
+    fig = px.bar(category_count, x='Existence Status', y='Count', text='Count',
+                 labels={'Existence Status': 'Existence Status', 'Count': 'Count'},
+                 title=f'Existence of {category.split(" - ")[0]}')
+
+    # Update the x-axis labels
+    fig.update_xaxes(ticktext=['Does Not Exist', 'Exist'], tickvals=[0, 1])
+    return fig
+
+
+def pie_chart(cube):
+    total_restaurants_by_area = cube[['refArea', 'Total number of restaurants']]
+
+    # Create a pie chart for total restaurants by area
+    return px.pie(total_restaurants_by_area, names='refArea', values='Total number of restaurants',
+                  title='Total Number of Restaurants by Area')
+
+
+def heat_map(cube):
+    # Percentage shares are precomputed in the cube
+    share_columns = {aggregates.share_column(column): column for column in COUNT_COLUMNS}
+    percentage_data = cube[['refArea'] + list(share_columns)].rename(columns=share_columns)
+
+    # Create a heat map using Plotly Express
+    return px.imshow(
+        percentage_data.set_index('refArea').T,
+        labels=dict(x='Area', y='Metric', color='Percentage (%)'),
+        title='Heat Map of Percentage of Total Numbers of Restaurants, Hotels, and Cafes'
+    )
+
+
+def histogram(cube):
+    hist_data = aggregates.flag_counts(cube, INITIATIVES_COLUMN).reset_index()
+    hist_data.columns = ['Existence of Initiatives', 'Count']
+
+    # Create a bar plot using Plotly Express
+    return px.bar(hist_data, x='Existence of Initiatives', y='Count', text='Count',
+                  labels={'Existence of Initiatives': 'Existence of Initiatives/Projects', 'Count': 'Number of Areas'},
+                  title='Existence of Initiatives and Projects in the Last Five Years')
+
+
+def initiatives_chart(cube):
+    initiative_data = aggregates.flag_counts(cube, INITIATIVES_COLUMN)
+
+    return px.bar(initiative_data, x=initiative_data.index, y=initiative_data.values,
+                  labels={'x': 'Existence of Initiatives', 'y': 'Number of Areas'},
+                  title='Existence of Initiatives and Projects in the Past Five Years')
+
+
+def scatter_plot(cube):
+    df_grouped = cube[['refArea', 'Total']]
+
+    # Create a scatter plot using Plotly Express
+    fig = px.scatter(df_grouped,
+                     x='refArea',
+                     y='Total',
+                     size='Total',
+                     color='Total',
+                     hover_name='refArea',
+                     text='refArea',
+                     title='Total Number of Restaurants, Hotels, and Cafes per Area (Summed)',
+                     labels={'Total': 'Total Number of Establishments', 'refArea': 'Area'},
+                     color_continuous_scale=px.colors.sequential.Plasma)
+
+    fig.update_traces(textposition='top center', marker=dict(line=dict(width=2, color='white')))
+    fig.update_layout(
+        width=1200,
+        height=800,
+        paper_bgcolor='#2e2e2e',
+        plot_bgcolor='#2e2e2e',
+        title_font=dict(size=24, family='Arial Black', color='white'),
+        xaxis_title_font=dict(size=18, family='Arial', color='white'),
+        yaxis_title_font=dict(size=18, family='Arial', color='white'),
+        legend_title_font=dict(size=16, color='white'),
+        margin=dict(l=50, r=50, t=70, b=50),
+        xaxis=dict(showgrid=False, showline=True, showticklabels=True, ticks='outside'),
+        yaxis=dict(showgrid=False, showline=True, showticklabels=True, ticks='outside')
+    )
+    return fig
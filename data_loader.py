@@ -0,0 +1,179 @@
+import hashlib
+import io
+import logging
+import os
+import time
+import urllib.error
+import urllib.request
+from collections import namedtuple
+
+import pandas as pd
+
+import fileio
+import settings
+
+logger = logging.getLogger(__name__)
+
+DATA_URL = settings.DATA_URL
+CACHE_DIR = settings.CACHE_DIR
+MANIFEST_NAME = "manifest.json"
+REVALIDATE_SECONDS = settings.REVALIDATE_SECONDS
+OFFLINE = settings.OFFLINE
+FETCH_TIMEOUT = settings.FETCH_TIMEOUT
+
+DROP_COLUMNS = ["publisher", "dataset", "references"]
+COUNT_COLUMNS = ['Total number of restaurants', 'Total number of hotels', 'Total number of cafes']
+
+# Columns holding 0/1 existence flags, e.g. 'Existence of cafes - does not exist'
+FLAG_PREFIX = "Existence of"
+
+# Bumped whenever the cleaned representation changes, so older snapshots are not reused:
+# it is part of every version and a manifest written under another schema is ignored
+SCHEMA_VERSION = "2"
+
+# A cleaned frame together with the version (content hash) of the CSV it came from
+Dataset = namedtuple("Dataset", ["version", "data"])
+
+
+# Only the columns the pages read are loaded from the CSV
+def is_used_column(column):
+    return column == 'refArea' or column in COUNT_COLUMNS or column.startswith(FLAG_PREFIX)
+
+
+# Smallest integer dtype holding every value of an integral column
+def _downcast(values):
+    if values.isna().any() or (values % 1 != 0).any():
+        return pd.to_numeric(values, downcast='float')
+    if (values >= 0).all():
+        return pd.to_numeric(values.astype('int64'), downcast='unsigned')
+    return pd.to_numeric(values.astype('int64'), downcast='integer')
+
+
+# Store the frame compactly: 'refArea' as a categorical, flags as int8 (nullable when a
+# flag is missing for some rows) and counts in the smallest safe integer type
+def apply_schema(data):
+    data['refArea'] = data['refArea'].astype('category')
+    for column in data.columns:
+        if column.startswith(FLAG_PREFIX):
+            data[column] = data[column].astype('Int8' if data[column].isna().any() else 'int8')
+    for column in COUNT_COLUMNS + ['Total']:
+        data[column] = _downcast(data[column])
+    return data
+
+
+def memory_footprint(data):
+    return int(data.memory_usage(deep=True).sum())
+
+
+# Apply the dashboard's cleaning steps to a raw frame
+def clean_data(data):
+    # Drop unnecessary columns
+    data = data.drop(columns=DROP_COLUMNS, errors="ignore")
+
+    # Modify 'refArea' by extracting the last part after the last slash
+    data['refArea'] = data['refArea'].str.rsplit('/', n=1).str[-1]
+
+    # Missing counts are counted as zero, as in the totals
+    data[COUNT_COLUMNS] = data[COUNT_COLUMNS].fillna(0)
+
+    # Calculate total establishments
+    data['Total'] = data[COUNT_COLUMNS].sum(axis=1)
+    return apply_schema(data)
+
+
+def _is_local(url):
+    return os.path.exists(url)
+
+
+# Fetch the source, returning (body, etag, last_modified); body is None when unchanged
+def fetch_source(url, etag=None, last_modified=None):
+    if _is_local(url):
+        mtime = str(os.stat(url).st_mtime_ns)
+        if mtime == last_modified:
+            return None, etag, last_modified
+        with open(url, 'rb') as file:
+            return file.read(), None, mtime
+
+    request = urllib.request.Request(url)
+    if etag:
+        request.add_header("If-None-Match", etag)
+    if last_modified:
+        request.add_header("If-Modified-Since", last_modified)
+    try:
+        with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response:
+            return response.read(), response.headers.get("ETag"), response.headers.get("Last-Modified")
+    except urllib.error.HTTPError as error:
+        if error.code == 304:
+            return None, etag, last_modified
+        raise
+
+
+def snapshot_path(cache_dir, version):
+    return os.path.join(cache_dir, f"tourism-{version}.parquet")
+
+
+def read_manifest(cache_dir=CACHE_DIR):
+    return fileio.read_json(os.path.join(cache_dir, MANIFEST_NAME))
+
+
+# Load the cleaned dataset, revalidating the source and falling back to the local snapshot.
+# Returns None instead when the current version is known_version, so pollers skip the read.
+def load_dataset(url=DATA_URL, cache_dir=CACHE_DIR, offline=OFFLINE, known_version=None):
+    # A manifest from another schema is not revalidated against either: the source would
+    # answer unchanged and the old snapshot would be kept
+    manifest = read_manifest(cache_dir)
+    if manifest is not None and (
+        manifest.get("url") != url
+        or manifest.get("schema") != SCHEMA_VERSION
+        or not os.path.exists(snapshot_path(cache_dir, manifest["version"]))
+    ):
+        manifest = None
+
+    if not offline:
+        validators = manifest or {}
+        try:
+            body, etag, last_modified = fetch_source(url, validators.get("etag"), validators.get("last_modified"))
+        except OSError as error:
+            if manifest is None:
+                raise
+            logger.warning("Could not revalidate %s (%s), using snapshot %s", url, error, manifest["version"])
+        else:
+            if body is not None:
+                version = hashlib.sha256(body + SCHEMA_VERSION.encode()).hexdigest()[:16]
+                path = snapshot_path(cache_dir, version)
+                data = None
+                memory_bytes = validators.get("memory_bytes") if validators.get("version") == version else None
+                if not os.path.exists(path):
+                    data = clean_data(pd.read_csv(io.BytesIO(body), usecols=is_used_column))
+                    memory_bytes = memory_footprint(data)
+                    os.makedirs(cache_dir, exist_ok=True)
+                    fileio.atomic_write(path, lambda tmp_path: data.to_parquet(tmp_path, index=False))
+                    logger.info("Stored snapshot %s of %s (%d rows, %d bytes in memory)",
+                                version, url, len(data), memory_bytes)
+                manifest = {
+                    "url": url,
+                    "schema": SCHEMA_VERSION,
+                    "version": version,
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "fetched_at": time.time(),
+                    "memory_bytes": memory_bytes,
+                }
+                fileio.write_json(os.path.join(cache_dir, MANIFEST_NAME), manifest)
+                if data is not None:
+                    return Dataset(version, data)
+
+    if manifest is None:
+        raise FileNotFoundError(f"No local snapshot of {url} in {cache_dir}")
+    if manifest["version"] == known_version:
+        return None
+    return Dataset(manifest["version"], pd.read_parquet(snapshot_path(cache_dir, manifest["version"])))
+
+
+# Report the in-memory footprint of the current dataset version, column by column
+if __name__ == "__main__":
+    dataset = load_dataset()
+    usage = dataset.data.memory_usage(deep=True, index=False)
+    print(f"version {dataset.version}: {len(dataset.data)} rows, {memory_footprint(dataset.data)} bytes")
+    for column, dtype in dataset.data.dtypes.items():
+        print(f"  {column}: {dtype}, {usage[column]} bytes")
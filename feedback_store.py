@@ -0,0 +1,97 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import settings
+
+logger = logging.getLogger(__name__)
+
+# SQLite database holding the submitted feedback, keyed by email
+DB_PATH = settings.FEEDBACK_DB
+
+# Text file the feedback form used to append 'email:feedback' lines to
+LEGACY_PATH = 'submitted_emails.txt'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feedback (
+    email TEXT PRIMARY KEY,
+    feedback TEXT NOT NULL,
+    submitted_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+# Parse the legacy 'email:feedback' lines; feedback may itself contain ':'
+def read_legacy_feedback(path):
+    with open(path, 'r') as file:
+        for line in file:
+            saved_email, separator, saved_feedback = line.rstrip('\n').partition(':')
+            if separator:
+                yield saved_email.strip(), saved_feedback.strip()
+
+
+# Feedback storage shared by every session in the process; safe across processes too,
+# as SQLite in WAL mode serializes the writers
+class FeedbackStore:
+    def __init__(self, path=DB_PATH, legacy_path=LEGACY_PATH):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+        if legacy_path and os.path.exists(legacy_path):
+            self.migrate_legacy(legacy_path)
+
+    # SQLite connections can't be shared between threads, so each session thread gets its own
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # Import the legacy text file once; later duplicates of an email are ignored like they were before
+    def migrate_legacy(self, legacy_path):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            done = conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_migrated'").fetchone()
+            if not done:
+                now = time.time()
+                cursor = conn.executemany(
+                    "INSERT OR IGNORE INTO feedback (email, feedback, submitted_at) VALUES (?, ?, ?)",
+                    ((email, feedback, now) for email, feedback in read_legacy_feedback(legacy_path)),
+                )
+                conn.execute("INSERT INTO meta (key, value) VALUES ('legacy_migrated', ?)", (legacy_path,))
+                logger.info("Migrated %d feedback entries from %s", cursor.rowcount, legacy_path)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if not done:
+            os.replace(legacy_path, legacy_path + '.migrated')
+
+    def get(self, email):
+        row = self._connection().execute("SELECT feedback FROM feedback WHERE email = ?", (email,)).fetchone()
+        return row[0] if row else None
+
+    # Store the feedback unless the email already submitted some; returns (saved, previous_feedback)
+    def submit(self, email, feedback):
+        conn = self._connection()
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO feedback (email, feedback, submitted_at) VALUES (?, ?, ?)",
+            (email, feedback, time.time()),
+        )
+        if cursor.rowcount:
+            return True, None
+        return False, self.get(email)
+
+    def count(self):
+        return self._connection().execute("SELECT COUNT(*) FROM feedback").fetchone()[0]
@@ -0,0 +1,68 @@
+import threading
+from collections import OrderedDict
+
+import settings
+
+DEFAULT_MAX_BYTES = settings.FIGURE_CACHE_BYTES
+
+
+# LRU cache of serialized Plotly figures keyed on (page, dataset version, widget values),
+# bounded by the total size of the stored JSON
+class FigureCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(page, version, **widgets):
+        return (page, version, tuple(sorted(widgets.items())))
+
+    def get(self, key):
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def put(self, key, payload):
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = payload
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    # Return the cached figure JSON, building and storing it on a miss
+    def get_or_build(self, key, build):
+        payload = self.get(key)
+        if payload is None:
+            payload = build().to_json()
+            self.put(key, payload)
+        return payload
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,31 @@
+import json
+import os
+import tempfile
+
+
+# Write a file next to its destination and rename it into place, so readers never see a partial file
+def atomic_write(path, write):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+# Parsed contents of a JSON file, or default when it is missing or unreadable
+def read_json(path, default=None):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json(path, value):
+    def write(tmp_path):
+        with open(tmp_path, 'w') as file:
+            json.dump(value, file, indent=2)
+    atomic_write(path, write)
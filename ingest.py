@@ -0,0 +1,108 @@
+import glob
+import hashlib
+import logging
+import os
+
+import pandas as pd
+
+import aggregates
+import data_loader
+import fileio
+import settings
+
+logger = logging.getLogger(__name__)
+
+# Rows read from a CSV at a time
+CHUNK_ROWS = 100_000
+
+# Per-file partial aggregates and the manifest recording which file versions they cover
+STATE_DIR = os.path.join(settings.CACHE_DIR, "ingest")
+STATE_MANIFEST = "ingest.json"
+
+
+# Expand a list of paths and glob patterns (e.g. 'extracts/*.csv') into sorted file paths
+def expand_paths(patterns):
+    paths = set()
+    for pattern in patterns:
+        paths.update(glob.glob(pattern) or [pattern])
+    return sorted(paths)
+
+
+# Cheap identity of a file version: changes whenever the file is rewritten
+def fingerprint(path):
+    stat = os.stat(path)
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+# Version of the combined dataset, derived from the files it is built from (its frame is
+# None: only the aggregates of several extracts are kept, see ingest())
+def dataset_version(paths):
+    digest = hashlib.sha256(data_loader.SCHEMA_VERSION.encode())
+    for path in paths:
+        digest.update(f"{os.path.abspath(path)}:{fingerprint(path)}\n".encode())
+    return data_loader.Dataset(digest.hexdigest()[:16], None)
+
+
+# Read a CSV lazily, applying the usual cleaning to every chunk
+def iter_chunks(path, chunksize=CHUNK_ROWS):
+    for chunk in pd.read_csv(path, chunksize=chunksize, usecols=data_loader.is_used_column):
+        yield data_loader.clean_data(chunk)
+
+
+# Fold the chunks of one file into its per-area partial aggregates
+def file_partial(path, chunksize=CHUNK_ROWS):
+    running = None
+    for chunk in iter_chunks(path, chunksize):
+        partial = aggregates.partial_cube(chunk)
+        running = partial if running is None else aggregates.merge_partials([running, partial])
+    return running
+
+
+def _partial_path(state_dir, path):
+    return os.path.join(state_dir, hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:16] + ".parquet")
+
+
+# Build the per-area cube over every file, only reading the files that are new or changed
+# since the last call; the other files' partial aggregates are reused from state_dir
+def ingest(paths, state_dir=STATE_DIR, chunksize=CHUNK_ROWS):
+    os.makedirs(state_dir, exist_ok=True)
+    state_path = os.path.join(state_dir, STATE_MANIFEST)
+    state = fileio.read_json(state_path, {})
+    partials = []
+    for path in paths:
+        key = os.path.abspath(path)
+        partial_path = _partial_path(state_dir, path)
+        current = fingerprint(path)
+        if state.get(key) == current and os.path.exists(partial_path):
+            partial = pd.read_parquet(partial_path).set_index('refArea')
+        else:
+            logger.info("Ingesting %s", path)
+            partial = file_partial(path, chunksize)
+            if partial is None:
+                continue
+            partial.index = partial.index.astype(str)
+            partial.index.name = 'refArea'
+            fileio.atomic_write(partial_path, lambda tmp_path: partial.reset_index().to_parquet(tmp_path, index=False))
+            state[key] = current
+        partials.append(partial)
+
+    fileio.write_json(state_path, state)
+    if not partials:
+        raise ValueError("No rows found in the ingested files")
+    return aggregates.finalize_cube(aggregates.merge_partials(partials))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Aggregate one or more tourism CSV extracts incrementally")
+    parser.add_argument("paths", nargs="+", help="CSV files or glob patterns")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--state-dir", default=STATE_DIR)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    paths = expand_paths(args.paths)
+    cube = ingest(paths, args.state_dir, args.chunksize)
+    print(f"version {dataset_version(paths).version}: {len(paths)} files, {len(cube)} areas")
+    print(cube[['refArea', 'Rows', 'Total']].to_string(index=False))
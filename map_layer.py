@@ -0,0 +1,125 @@
+import html
+import json
+
+import folium
+import numpy as np
+from branca.element import MacroElement
+from jinja2 import Template
+
+MAP_CENTER = [33.8547, 35.8623]
+
+# Totals below 50 are green, below 100 yellow, below 200 orange, anything else red
+COLOR_BINS = [50, 100, 200]
+COLORS = np.array(['green', 'yellow', 'orange', 'red'])
+
+# Placeholder in the rendered map document for the initial minimum-total filter
+MIN_TOTAL_TOKEN = "__MIN_TOTAL__"
+
+
+def bin_colors(totals):
+    return COLORS[np.searchsorted(COLOR_BINS, totals, side='right')]
+
+
+# One GeoJSON point per located area, with the total, its color bin and the popup text as properties
+def feature_collection(cube, name_column='refArea'):
+    located = cube.dropna(subset=['Latitude', 'Longitude'])
+    totals = located['Total']
+    coordinates = np.column_stack([located['Longitude'].to_numpy(), located['Latitude'].to_numpy()]).tolist()
+    popups = (located[name_column].astype(str) + ': ' + totals.astype(str)).map(html.escape).tolist()
+    colors = bin_colors(totals.to_numpy()).tolist()
+    return {
+        'type': 'FeatureCollection',
+        'features': [
+            {
+                'type': 'Feature',
+                'geometry': {'type': 'Point', 'coordinates': point},
+                'properties': {'total': total, 'color': color, 'popup': popup},
+            }
+            for point, total, color, popup in zip(coordinates, totals.tolist(), colors, popups)
+        ],
+    }
+
+
+# Draws the whole collection as circle markers and filters it by total in the browser: a
+# range input in a map control redraws the layer from the embedded collection, so moving
+# it sends nothing to the server and does not reload the map
+class FilteredPoints(MacroElement):
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function() {
+            var collection = {{ this.collection }};
+            var minTotal = {{ this.min_total }};
+            var layer = L.geoJSON(null, {
+                filter: function(feature) {
+                    return feature.properties.total >= minTotal;
+                },
+                pointToLayer: function(feature, latlng) {
+                    return L.circleMarker(latlng, {
+                        radius: 10,
+                        color: feature.properties.color,
+                        fill: true,
+                        fillColor: feature.properties.color,
+                        fillOpacity: 0.6
+                    });
+                },
+                onEachFeature: function(feature, layer) {
+                    layer.bindPopup(feature.properties.popup);
+                }
+            }).addData(collection).addTo({{ this._parent.get_name() }});
+
+            var control = L.control({position: 'topright'});
+            control.onAdd = function() {
+                var container = L.DomUtil.create('div', 'leaflet-bar');
+                container.style.background = 'white';
+                container.style.padding = '6px 10px';
+                container.innerHTML = '<label>Minimum total: <b>' + minTotal + '</b><br>'
+                    + '<input type="range" min="0" max="{{ this.max_total }}" step="1" value="' + minTotal + '"></label>';
+                var input = container.querySelector('input');
+                var value = container.querySelector('b');
+                // Dragging the input must not pan the map
+                L.DomEvent.disableClickPropagation(container);
+                L.DomEvent.disableScrollPropagation(container);
+                input.addEventListener('input', function() {
+                    minTotal = Number(input.value);
+                    value.textContent = input.value;
+                    layer.clearLayers();
+                    layer.addData(collection);
+                });
+                return container;
+            };
+            control.addTo({{ this._parent.get_name() }});
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, collection, min_total=MIN_TOTAL_TOKEN):
+        super().__init__()
+        self._name = 'FilteredPoints'
+        self.collection = json.dumps(collection)
+        self.min_total = min_total
+        self.max_total = max((feature['properties']['total'] for feature in collection['features']), default=0)
+
+
+# Render the base map with every point once; the initial threshold is filled in later with
+# render_filtered_map
+def build_map_document(collection, zoom_start=8):
+    m_filtered = folium.Map(location=MAP_CENTER, zoom_start=zoom_start)
+    FilteredPoints(collection).add_to(m_filtered)
+    return m_filtered.get_root().render()
+
+
+def render_filtered_map(document, min_total):
+    return document.replace(MIN_TOTAL_TOKEN, str(int(min_total)))
+
+
+# Map centered on a single district with an info marker, as on the Tourist Spots page
+def district_map(name, latitude, longitude, total):
+    map_center = [latitude, longitude]
+    m_district = folium.Map(location=map_center, zoom_start=12)
+
+    folium.Marker(
+        location=map_center,
+        popup=f"{name}: {total} establishments",
+        icon=folium.Icon(color='blue', icon='info-sign')
+    ).add_to(m_district)
+    return m_district
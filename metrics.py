@@ -0,0 +1,169 @@
+import bisect
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger("tourism.metrics")
+
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Labels (page, session, kind) of the rerun running on the current thread; Streamlit
+# runs each session's script in its own thread. kind is "full" for a whole-script rerun
+# and "fragment" for a fragment rerun.
+_context = threading.local()
+
+
+def _format_labels(labels):
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in labels)
+    return ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped))
+
+
+def _sample(name, labels, value):
+    if not labels:
+        return f'{name} {value}'
+    return f'{name}{{{_format_labels(labels)}}} {value}'
+
+
+# Write the structured span logs as JSON lines to stderr
+def configure_logging():
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+# Timing spans, counters and gauges for the dashboard, rendered in Prometheus text format
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._collectors = []
+
+    # Label every span recorded on this thread until the next bind
+    @staticmethod
+    def bind(**labels):
+        _context.labels = labels
+
+    @staticmethod
+    def labels():
+        return getattr(_context, 'labels', {})
+
+    @contextmanager
+    def span(self, name):
+        labels = self.labels()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.observe(name, elapsed, page=labels.get('page', ''), kind=labels.get('kind', ''))
+            logger.info(json.dumps({"event": "span", "span": name, "seconds": round(elapsed, 6), **labels}))
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {'buckets': [0] * len(BUCKETS), 'count': 0, 'sum': 0.0}
+            index = bisect.bisect_left(BUCKETS, seconds)
+            if index < len(BUCKETS):
+                histogram['buckets'][index] += 1
+            histogram['count'] += 1
+            histogram['sum'] += seconds
+
+    def increment(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    # Register a callable returning [(metric name, labels dict, value)] read at scrape time
+    def add_collector(self, collect):
+        with self._lock:
+            self._collectors.append(collect)
+
+    def render_prometheus(self):
+        lines = ["# TYPE tourism_span_seconds histogram"]
+        with self._lock:
+            histograms = {key: dict(value, buckets=list(value['buckets'])) for key, value in self._histograms.items()}
+            counters = dict(self._counters)
+            collectors = list(self._collectors)
+        for (name, labels), histogram in sorted(histograms.items()):
+            labels = (('span', name),) + labels
+            cumulative = 0
+            for bound, count in zip(BUCKETS, histogram['buckets']):
+                cumulative += count
+                lines.append(_sample('tourism_span_seconds_bucket', labels + (('le', bound),), cumulative))
+            lines.append(_sample('tourism_span_seconds_bucket', labels + (('le', '+Inf'),), histogram['count']))
+            lines.append(_sample('tourism_span_seconds_sum', labels, histogram['sum']))
+            lines.append(_sample('tourism_span_seconds_count', labels, histogram['count']))
+        for (name, labels), value in sorted(counters.items()):
+            lines.append(_sample(name, labels, value))
+        for collect in collectors:
+            for name, labels, value in collect():
+                lines.append(_sample(name, tuple(sorted(labels.items())), value))
+        return "\n".join(lines) + "\n"
+
+
+# Serve /metrics from a daemon thread next to the Streamlit server, on the first free port
+# of port .. port + ports - 1 so every process on a host gets its own endpoint
+def start_server(metrics, port, host="127.0.0.1", ports=1):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = metrics.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    for offset in range(ports):
+        try:
+            server = ThreadingHTTPServer((host, port + offset), Handler)
+            break
+        except OSError:
+            if offset == ports - 1:
+                raise
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info(json.dumps({"event": "metrics_server", "port": server.server_address[1]}))
+    return server
+
+
+# Profile a single rerun and dump the stats to directory; the path is stored in the yielded dict
+@contextmanager
+def profile(directory, name):
+    profiler = cProfile.Profile()
+    result = {}
+    profiler.enable()
+    try:
+        yield result
+    finally:
+        profiler.disable()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{name.replace(' ', '_')}-{int(time.time())}.prof")
+        profiler.dump_stats(path)
+        result['path'] = path
+        logger.info(json.dumps({"event": "profile", "path": path, **Metrics.labels()}))
+
+
+def top_functions(path, limit=25):
+    stream = io.StringIO()
+    pstats.Stats(path, stream=stream).sort_stats('cumulative').print_stats(limit)
+    return stream.getvalue()
@@ -0,0 +1,48 @@
+import logging
+
+import pandas as pd
+
+import aggregates
+import areas
+import data_loader
+import ingest
+import settings
+
+logger = logging.getLogger(__name__)
+
+# Loading and preparation shared by the app, its background refresher and the offline tools
+
+
+# Load the cleaned dataset (see data_loader for the on-disk snapshot and offline fallback);
+# returns None when the source is still known_version
+def load_source(known_version=None, offline=settings.OFFLINE):
+    if settings.DATA_FILES:
+        # Several extracts: only their aggregates are kept in memory (see prepare_cube)
+        dataset = ingest.dataset_version(ingest.expand_paths(settings.DATA_FILES))
+        return None if dataset.version == known_version else dataset
+    return data_loader.load_dataset(offline=offline, known_version=known_version)
+
+
+# Attach coordinates, matching area names regardless of punctuation (see areas.normalize_name)
+def with_coordinates(cube):
+    located = {name: areas.lookup_coordinates(name) for name in cube['refArea']}
+    coordinate_frame = pd.DataFrame.from_dict(
+        {name: value for name, value in located.items() if value is not None}, orient='index', columns=['Latitude', 'Longitude']
+    )
+    unresolved = [name for name, value in located.items() if value is None]
+    if unresolved:
+        logger.warning("No coordinates for areas: %s", ", ".join(unresolved))
+    return cube.join(coordinate_frame, on='refArea')
+
+
+# Build the per-area cube every page reads from
+def prepare_cube(dataset):
+    if dataset.data is None:
+        # Fold the extracts chunk by chunk; unchanged files are not read again
+        return with_coordinates(ingest.ingest(ingest.expand_paths(settings.DATA_FILES)))
+    return with_coordinates(aggregates.build_cube(dataset.data))
+
+
+# Cube over the rows of a row-level dataset selected by a boolean mask (see query.QueryIndex)
+def filtered_cube(dataset, mask):
+    return with_coordinates(aggregates.build_cube(dataset.data[mask]))
@@ -0,0 +1,86 @@
+import hashlib
+from collections import namedtuple
+
+import numpy as np
+
+import aggregates
+from data_loader import COUNT_COLUMNS, FLAG_PREFIX
+
+# A row filter: features every row must have, features it must not have, and inclusive
+# (low, high) bounds on count columns. Features are the names parsed from the existence
+# columns, e.g. 'cafes' from 'Existence of cafes - does not exist'.
+Filter = namedtuple("Filter", ["must_have", "must_not_have", "ranges"])
+
+NO_FILTER = Filter((), (), {})
+
+
+# Split 'Existence of cafes - does not exist' into ('cafes', False) and
+# 'Existence of ... - exists' into (..., True): the feature and what a flag of 1 means
+def parse_flag(column):
+    feature, _, meaning = column[len(FLAG_PREFIX):].strip().rpartition(' - ')
+    return feature, meaning.strip() == 'exists'
+
+
+def is_empty(row_filter):
+    return not (row_filter.must_have or row_filter.must_not_have or row_filter.ranges)
+
+
+# Stable short key for a filter, used in cache keys and view versions
+def filter_key(row_filter):
+    canonical = repr((
+        sorted(row_filter.must_have),
+        sorted(row_filter.must_not_have),
+        sorted((column, (int(low), int(high))) for column, (low, high) in row_filter.ranges.items()),
+    ))
+    return hashlib.sha256(canonical.encode()).hexdigest()[:12]
+
+
+# Indexes over the rows of one dataset version, built once and queried on every filter
+# change. Each feature has two packed bitmaps (rows where it exists, rows where it is
+# known not to exist; unanswered rows are in neither), so feature conditions are combined
+# with bitwise ands over len(data) / 8 bytes. Count columns are kept sorted with their row
+# order, so a range is two binary searches plus marking the matching rows.
+class QueryIndex:
+    def __init__(self, data):
+        self.rows = len(data)
+        self.features = {}
+        for column in aggregates.flag_columns(data):
+            feature, exists_when_set = parse_flag(column)
+            values = data[column]
+            answered = values.notna().to_numpy()
+            is_set = (values.fillna(0).to_numpy() == 1) & answered
+            exists = is_set if exists_when_set else answered & ~is_set
+            self.features[feature] = (np.packbits(exists), np.packbits(answered & ~exists))
+
+        self.counts = {}
+        for column in COUNT_COLUMNS + ['Total']:
+            values = data[column].to_numpy()
+            order = np.argsort(values, kind='stable')
+            self.counts[column] = (values[order], order)
+
+    # Smallest and largest value of a count column, for range widgets
+    def bounds(self, column):
+        values, _ = self.counts[column]
+        return (int(values[0]), int(values[-1])) if len(values) else (0, 0)
+
+    def _range_bits(self, column, low, high):
+        values, order = self.counts[column]
+        start = np.searchsorted(values, low, side='left')
+        end = np.searchsorted(values, high, side='right')
+        selected = np.zeros(self.rows, dtype=bool)
+        selected[order[start:end]] = True
+        return np.packbits(selected)
+
+    # Boolean mask over the rows matching every condition of the filter
+    def mask(self, row_filter):
+        bits = np.full((self.rows + 7) // 8, 0xFF, dtype=np.uint8)
+        for feature in row_filter.must_have:
+            bits &= self.features[feature][0]
+        for feature in row_filter.must_not_have:
+            bits &= self.features[feature][1]
+        for column, (low, high) in row_filter.ranges.items():
+            bits &= self._range_bits(column, low, high)
+        return np.unpackbits(bits, count=self.rows).astype(bool)
+
+    def count(self, row_filter):
+        return int(self.mask(row_filter).sum())
@@ -0,0 +1,92 @@
+import logging
+import threading
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+# A consistent set of data for one dataset version: the dataset and the per-area cube
+# derived from it. generation increases by one every time a new version is swapped in.
+Snapshot = namedtuple("Snapshot", ["generation", "dataset", "cube"])
+
+# Until the first snapshot is published, failed loads are retried after this many seconds,
+# doubling up to the poll interval
+RETRY_SECONDS = 5
+
+
+# Polls the source from a background thread and swaps in fully prepared snapshots, so
+# sessions never wait on a reload. Readers take current() once per rerun and keep using
+# that snapshot even if a newer one is published meanwhile.
+class Refresher:
+    # load(known_version) returns a Dataset, or None when the source still is known_version;
+    # prepare(dataset) returns the cube for a new dataset
+    def __init__(self, load, prepare, interval):
+        self._load = load
+        self._prepare = prepare
+        self.interval = interval
+        self._snapshot = None
+        self._error = None
+        self._refresh_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def generation(self):
+        snapshot = self._snapshot
+        return snapshot.generation if snapshot else 0
+
+    # Check the source once and publish a new snapshot if it changed; returns whether it did
+    def refresh(self):
+        with self._refresh_lock:
+            current = self._snapshot
+            dataset = self._load(current.dataset.version if current else None)
+            if dataset is None or (current is not None and dataset.version == current.dataset.version):
+                return False
+            cube = self._prepare(dataset)
+            # A single reference assignment, so readers see either the old or the new snapshot
+            self._snapshot = Snapshot(self.generation + 1, dataset, cube)
+            logger.info("Published dataset version %s as generation %d", dataset.version, self._snapshot.generation)
+            return True
+
+    # Check the source once, recording rather than raising a failure
+    def _try_refresh(self):
+        try:
+            self.refresh()
+            self._error = None
+        except Exception as error:
+            self._error = error
+            logger.exception("Dataset refresh failed")
+
+    # Latest published snapshot; only the very first call waits for the initial load. While
+    # no snapshot could be loaded yet, every call retries the load itself.
+    def current(self, timeout=None):
+        snapshot = self._snapshot
+        if snapshot is None:
+            self._ready.wait(timeout)
+            if self._snapshot is None and self._error is not None:
+                self._try_refresh()
+            snapshot = self._snapshot
+            if snapshot is None:
+                raise self._error or TimeoutError("Dataset is not loaded yet")
+        return snapshot
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="dataset-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        retry = RETRY_SECONDS
+        while True:
+            self._try_refresh()
+            self._ready.set()
+            if self._snapshot is None:
+                wait, retry = min(retry, self.interval), retry * 2
+            else:
+                wait = self.interval
+            if self._stop.wait(wait):
+                return
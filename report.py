@@ -0,0 +1,161 @@
+# Render a static snapshot of every dashboard chart and map for the current dataset
+# version, without Streamlit, spreading the figure building over a process pool.
+#
+#   python report.py --out report --formats html png --thresholds 0 50 100 200 --workers 4
+#
+# With --offline the dataset comes from the local snapshot only. Chart HTML files share one
+# plotly.min.js written next to them, so they open without network access; the maps still
+# load Leaflet and the map tiles from their CDNs when viewed.
+import argparse
+import html
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import charts
+import map_layer
+import pipeline
+
+logger = logging.getLogger(__name__)
+
+CHARTS = {
+    'bar-cafes': (charts.bar_chart, {'category': charts.BAR_CATEGORIES[0]}),
+    'bar-restaurants': (charts.bar_chart, {'category': charts.BAR_CATEGORIES[1]}),
+    'bar-hotels': (charts.bar_chart, {'category': charts.BAR_CATEGORIES[2]}),
+    'pie': (charts.pie_chart, {}),
+    'heat-map': (charts.heat_map, {}),
+    'histogram': (charts.histogram, {}),
+    'initiatives': (charts.initiatives_chart, {}),
+    'scatter': (charts.scatter_plot, {}),
+}
+
+DEFAULT_THRESHOLDS = [0, 50, 100, 200]
+
+# Set in each worker process by _init_worker
+_cube = None
+
+
+def _init_worker(cube):
+    global _cube
+    _cube = cube
+
+
+def _write(path, text):
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(text)
+
+
+def render_chart(name, out_dir, formats):
+    build, widgets = CHARTS[name]
+    fig = build(_cube, **widgets)
+    paths = []
+    if 'html' in formats:
+        paths.append(os.path.join(out_dir, f"{name}.html"))
+        fig.write_html(paths[-1], include_plotlyjs='directory')
+    if 'png' in formats:
+        paths.append(os.path.join(out_dir, f"{name}.png"))
+        fig.write_image(paths[-1])
+    return paths
+
+
+# The base map document is built once per worker and only the threshold differs per file
+@lru_cache(maxsize=None)
+def _map_document():
+    return map_layer.build_map_document(map_layer.feature_collection(_cube))
+
+
+def render_filtered_map(min_total, out_dir):
+    document = _map_document()
+    path = os.path.join(out_dir, f"filtered-map-{min_total}.html")
+    _write(path, map_layer.render_filtered_map(document, min_total))
+    return [path]
+
+
+def render_district(name, out_dir):
+    import folium
+    import areas
+
+    row = _cube[_cube['refArea'] == name].iloc[0]
+    m_district = map_layer.district_map(name, row['Latitude'], row['Longitude'], row['Total'])
+    spots = areas.lookup_recommendations(name) or ["No specific recommendations available for this district."]
+    m_district.get_root().html.add_child(folium.Element(
+        f"<h3>Insights for {html.escape(name)}</h3>"
+        f"<p>Total Number of Establishments: {row['Total']}</p>"
+        "<ul>" + "".join(f"<li>{html.escape(spot)}</li>" for spot in spots) + "</ul>"
+    ))
+    path = os.path.join(out_dir, f"district-{areas.normalize_name(name)}.html")
+    m_district.save(path)
+    return [path]
+
+
+# Run one (kind, argument) task in a worker; returns (task, paths, seconds)
+def run_task(task, out_dir, formats):
+    kind, argument = task
+    start = time.perf_counter()
+    if kind == 'chart':
+        paths = render_chart(argument, out_dir, formats)
+    elif kind == 'map':
+        paths = render_filtered_map(argument, out_dir)
+    else:
+        paths = render_district(argument, out_dir)
+    return task, paths, time.perf_counter() - start
+
+
+def report_tasks(cube, thresholds):
+    located = cube.dropna(subset=['Latitude', 'Longitude'])['refArea']
+    return (
+        [('chart', name) for name in CHARTS]
+        + [('map', int(threshold)) for threshold in thresholds]
+        + [('district', name) for name in located]
+    )
+
+
+def write_index(out_dir, version, results):
+    links = "".join(
+        f'<li><a href="{html.escape(os.path.basename(path))}">{html.escape(os.path.basename(path))}</a></li>'
+        for _, paths, _ in results for path in paths
+    )
+    _write(os.path.join(out_dir, "index.html"),
+           f"<html><body><h1>Tourism Statistics in Lebanon, dataset {version}</h1><ul>{links}</ul></body></html>")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render every dashboard figure to static files")
+    parser.add_argument("--out", default="report", help="output directory; one subdirectory per dataset version")
+    parser.add_argument("--formats", nargs="+", choices=["html", "png"], default=["html"])
+    parser.add_argument("--thresholds", nargs="+", type=int, default=DEFAULT_THRESHOLDS,
+                        help="minimum totals to render the filtered map at")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--offline", action="store_true", help="use the local dataset snapshot only")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if 'png' in args.formats:
+        try:
+            import kaleido  # noqa: F401
+        except ImportError:
+            parser.error("PNG output needs the kaleido package (pip install kaleido)")
+
+    dataset = pipeline.load_source(offline=args.offline)
+    cube = pipeline.prepare_cube(dataset)
+    out_dir = os.path.join(args.out, dataset.version)
+    os.makedirs(out_dir, exist_ok=True)
+
+    tasks = report_tasks(cube, args.thresholds)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(cube,)) as pool:
+        futures = [pool.submit(run_task, task, out_dir, args.formats) for task in tasks]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+
+    write_index(out_dir, dataset.version, results)
+    figures = sum(len(paths) for _, paths, _ in results)
+    slowest = max(results, key=lambda result: result[2])
+    logger.info("Rendered %d files for %d figures in %.2fs (%.1f figures/s, slowest %s %s at %.2fs) to %s",
+                figures, len(tasks), elapsed, len(tasks) / elapsed, slowest[0][0], slowest[0][1], slowest[2], out_dir)
+
+
+if __name__ == "__main__":
+    main()
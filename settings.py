@@ -0,0 +1,61 @@
+import os
+
+# Runtime configuration of the dashboard, read from the environment. Kept free of heavy
+# imports so the app can read it before deciding what else to load.
+
+# Source CSV on pkgcube (can be pointed at another URL or a local file path)
+DATA_URL = os.environ.get(
+    "TOURISM_DATA_URL",
+    "https://linked.aub.edu.lb/pkgcube/data/04c5f4bde28959f32bea81b9138bf5b3_20240905_163812.csv",
+)
+
+# Directory holding the cleaned snapshots and the manifest pointing at the latest one
+CACHE_DIR = os.environ.get("TOURISM_CACHE_DIR", ".data_cache")
+
+# How often the background refresher polls the source for a new release
+REVALIDATE_SECONDS = int(os.environ.get("TOURISM_REVALIDATE_SECONDS", "600"))
+
+# Seconds to wait for the data source or an image host before giving up on a request
+FETCH_TIMEOUT = int(os.environ.get("TOURISM_FETCH_TIMEOUT", "10"))
+
+# Set TOURISM_OFFLINE=1 to run from the local snapshot without touching the network
+OFFLINE = os.environ.get("TOURISM_OFFLINE", "") == "1"
+
+# SQLite database holding the submitted feedback
+FEEDBACK_DB = os.environ.get("TOURISM_FEEDBACK_DB", "feedback.db")
+
+# Memory budget for cached figures (serialized JSON size)
+FIGURE_CACHE_BYTES = int(os.environ.get("TOURISM_FIGURE_CACHE_BYTES", str(64 * 1024 * 1024)))
+
+# Set TOURISM_EAGER_IMPORTS=1 to import the plotting and mapping libraries and build all
+# derived data at startup, as the app did before the page registry (used for startup
+# comparisons)
+EAGER_IMPORTS = os.environ.get("TOURISM_EAGER_IMPORTS", "") == "1"
+
+# Port of the Prometheus /metrics endpoint served next to the app (empty, the default,
+# disables it) and the interface it listens on. With several server processes on one host,
+# each binds the first free port of METRICS_PORT .. METRICS_PORT + METRICS_PORTS - 1, so
+# scrape that range to observe every process.
+METRICS_PORT = os.environ.get("TOURISM_METRICS_PORT", "")
+METRICS_HOST = os.environ.get("TOURISM_METRICS_HOST", "127.0.0.1")
+METRICS_PORTS = int(os.environ.get("TOURISM_METRICS_PORTS", "8"))
+
+# Set TOURISM_SPAN_LOGS=0 to stop writing a JSON log line per timing span
+SPAN_LOGS = os.environ.get("TOURISM_SPAN_LOGS", "1") == "1"
+
+# Set TOURISM_ALLOW_PROFILING=1 to allow profiling a single rerun by opening the app with
+# ?profile=1; stats are written to PROFILE_DIR
+ALLOW_PROFILING = os.environ.get("TOURISM_ALLOW_PROFILING", "") == "1"
+PROFILE_DIR = os.environ.get("TOURISM_PROFILE_DIR", "profiles")
+
+# Comma-separated CSV paths or glob patterns (e.g. 'extracts/*.csv'); when set, the app is
+# fed from these files through the chunked ingestion instead of DATA_URL
+DATA_FILES = [pattern.strip() for pattern in os.environ.get("TOURISM_DATA_FILES", "").split(",") if pattern.strip()]
+
+# Directory through which several server processes on one host share the prepared
+# dataset as memory-mapped Arrow files (empty: every process loads its own copy)
+SHARED_DIR = os.environ.get("TOURISM_SHARED_DIR", "")
+
+# Set TOURISM_FRAGMENTS=0 to rerun the whole script on every widget interaction instead of
+# only the page fragment owning the widget (used for rerun cost comparisons)
+FRAGMENTS = os.environ.get("TOURISM_FRAGMENTS", "1") == "1"
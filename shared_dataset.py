@@ -0,0 +1,117 @@
+import fcntl
+import logging
+import os
+import shutil
+import time
+from contextlib import contextmanager
+
+import pyarrow as pa
+
+import data_loader
+import fileio
+import settings
+
+logger = logging.getLogger(__name__)
+
+# Several Streamlit processes on one host share the prepared dataset through SHARED_DIR:
+# one of them loads and prepares a version and publishes it as uncompressed Arrow IPC
+# files, and every process memory-maps those files instead of holding its own copy.
+SHARED_DIR = settings.SHARED_DIR
+POINTER_NAME = "current.json"
+LOCK_NAME = "publish.lock"
+
+# Published versions kept on disk, so processes still reading an older one can finish
+KEEP_VERSIONS = 3
+
+
+def read_pointer(shared_dir=SHARED_DIR):
+    return fileio.read_json(os.path.join(shared_dir, POINTER_NAME))
+
+
+def _write_pointer(shared_dir, pointer):
+    fileio.write_json(os.path.join(shared_dir, POINTER_NAME), pointer)
+
+
+# Only one process at a time loads and publishes; the others wait and then attach
+@contextmanager
+def _publish_lock(shared_dir):
+    with open(os.path.join(shared_dir, LOCK_NAME), 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _write_table(frame, path):
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+# Memory-map an Arrow file; numeric columns without nulls become pandas views of the
+# mapping, shared through the page cache by every process attached to it
+def _map_table(path):
+    with pa.memory_map(path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def _prune(shared_dir, current):
+    versions = sorted(
+        (entry for entry in os.scandir(shared_dir) if entry.is_dir() and '.tmp-' not in entry.name),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True,
+    )
+    for entry in versions[KEEP_VERSIONS:]:
+        if entry.name != current:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+# Write a dataset version and its cube, then point current.json at it
+def publish(dataset, cube, shared_dir=SHARED_DIR):
+    target = os.path.join(shared_dir, dataset.version)
+    if not os.path.exists(target):
+        tmp_dir = f"{target}.tmp-{os.getpid()}"
+        os.makedirs(tmp_dir, exist_ok=True)
+        if dataset.data is not None:
+            _write_table(dataset.data, os.path.join(tmp_dir, "data.arrow"))
+        _write_table(cube, os.path.join(tmp_dir, "cube.arrow"))
+        os.rename(tmp_dir, target)
+    _write_pointer(shared_dir, {"version": dataset.version, "published_at": time.time()})
+    _prune(shared_dir, dataset.version)
+    logger.info("Published dataset version %s to %s", dataset.version, shared_dir)
+
+
+def attach_dataset(version, shared_dir=SHARED_DIR):
+    path = os.path.join(shared_dir, version, "data.arrow")
+    # Datasets ingested from several extracts only have a cube
+    data = _map_table(path) if os.path.exists(path) else None
+    return data_loader.Dataset(version, data)
+
+
+def attach_cube(dataset, shared_dir=SHARED_DIR):
+    return _map_table(os.path.join(shared_dir, dataset.version, "cube.arrow"))
+
+
+# Return the shared dataset if it differs from known_version, else None. When nothing is
+# published yet, or the published version is older than max_age, this process takes the
+# publish lock, checks the source with load(known_version) and publishes what it finds.
+def sync(load, prepare, known_version=None, shared_dir=SHARED_DIR, max_age=settings.REVALIDATE_SECONDS):
+    os.makedirs(shared_dir, exist_ok=True)
+    pointer = read_pointer(shared_dir)
+    if pointer is None or time.time() - pointer["published_at"] > max_age:
+        with _publish_lock(shared_dir):
+            # Another process may have published while this one waited for the lock
+            pointer = read_pointer(shared_dir)
+            if pointer is None or time.time() - pointer["published_at"] > max_age:
+                dataset = load(pointer["version"] if pointer else None)
+                if dataset is None:
+                    pointer["published_at"] = time.time()
+                    _write_pointer(shared_dir, pointer)
+                else:
+                    publish(dataset, prepare(dataset), shared_dir)
+                    pointer = read_pointer(shared_dir)
+    if pointer["version"] == known_version:
+        return None
+    return attach_dataset(pointer["version"], shared_dir)
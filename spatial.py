@@ -0,0 +1,97 @@
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180
+
+# Grid cell size in degrees (about 5.5 km of latitude)
+CELL_DEGREES = 0.05
+
+
+# Great-circle distance in km from one point to arrays of points
+def haversine_km(lat, lon, lats, lons):
+    lat, lon, lats, lons = np.radians(lat), np.radians(lon), np.radians(lats), np.radians(lons)
+    a = np.sin((lats - lat) / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+# Uniform lat/lon grid over a set of points (areas or towns), built once per dataset
+# version. Radius queries only compute distances for points in the cells overlapping the
+# search circle; nearest queries grow a ring of cells until enough points are found.
+class SpatialIndex:
+    def __init__(self, lats, lons, cell_degrees=CELL_DEGREES):
+        self.lats = np.asarray(lats, dtype='float64')
+        self.lons = np.asarray(lons, dtype='float64')
+        self.cell_degrees = cell_degrees
+
+        rows = np.floor(self.lats / cell_degrees).astype('int64')
+        cols = np.floor(self.lons / cell_degrees).astype('int64')
+        self._order = np.lexsort((cols, rows))
+        keys = np.stack([rows[self._order], cols[self._order]], axis=1)
+        unique, starts, counts = np.unique(keys, axis=0, return_index=True, return_counts=True)
+        self._cells = {(int(row), int(col)): (start, start + count) for (row, col), start, count in zip(unique, starts, counts)}
+        if len(unique):
+            self._row_range = (int(unique[:, 0].min()), int(unique[:, 0].max()))
+            self._col_range = (int(unique[:, 1].min()), int(unique[:, 1].max()))
+
+    def __len__(self):
+        return len(self.lats)
+
+    def _candidates(self, row_span, col_span):
+        slices = [
+            self._order[start:end]
+            for row in range(*row_span)
+            for col in range(*col_span)
+            for start, end in [self._cells.get((row, col), (0, 0))]
+            if end > start
+        ]
+        return np.concatenate(slices) if slices else np.empty(0, dtype='int64')
+
+    def _select(self, candidates, lat, lon, radius_km, mask, exclude):
+        if mask is not None:
+            candidates = candidates[mask[candidates]]
+        if exclude is not None:
+            candidates = candidates[candidates != exclude]
+        distances = haversine_km(lat, lon, self.lats[candidates], self.lons[candidates])
+        if radius_km is not None:
+            keep = distances <= radius_km
+            candidates, distances = candidates[keep], distances[keep]
+        order = np.argsort(distances, kind='stable')
+        return candidates[order], distances[order]
+
+    # Points within radius_km of (lat, lon), nearest first; returns (indices, distances in km).
+    # mask is an optional boolean array over all points; exclude an index to leave out.
+    def within(self, lat, lon, radius_km, mask=None, exclude=None):
+        if not len(self):
+            return np.empty(0, dtype='int64'), np.empty(0)
+        lat_degrees = radius_km / KM_PER_DEGREE
+        max_lat = min(abs(lat) + lat_degrees, 89.9)
+        lon_degrees = min(radius_km / (KM_PER_DEGREE * np.cos(np.radians(max_lat))), 180.0)
+        row_span = (int(np.floor((lat - lat_degrees) / self.cell_degrees)), int(np.floor((lat + lat_degrees) / self.cell_degrees)) + 1)
+        col_span = (int(np.floor((lon - lon_degrees) / self.cell_degrees)), int(np.floor((lon + lon_degrees) / self.cell_degrees)) + 1)
+        # Don't walk empty cells outside the indexed extent
+        row_span = (max(row_span[0], self._row_range[0]), min(row_span[1], self._row_range[1] + 1))
+        col_span = (max(col_span[0], self._col_range[0]), min(col_span[1], self._col_range[1] + 1))
+        return self._select(self._candidates(row_span, col_span), lat, lon, radius_km, mask, exclude)
+
+    # The k points nearest to (lat, lon); returns (indices, distances in km)
+    def nearest(self, lat, lon, k=5, mask=None, exclude=None):
+        if not len(self):
+            return np.empty(0, dtype='int64'), np.empty(0)
+        row = int(np.floor(lat / self.cell_degrees))
+        col = int(np.floor(lon / self.cell_degrees))
+        max_ring = max(abs(row - self._row_range[0]), abs(row - self._row_range[1]),
+                       abs(col - self._col_range[0]), abs(col - self._col_range[1]))
+        ring = 0
+        while True:
+            candidates, distances = self._select(
+                self._candidates((row - ring, row + ring + 1), (col - ring, col + ring + 1)),
+                lat, lon, None, mask, exclude,
+            )
+            if len(candidates) >= k or ring >= max_ring:
+                break
+            ring = min(max(1, ring * 2), max_ring)
+        if len(candidates) < k:
+            return candidates, distances
+        # Points in cells outside the ring may still be closer than the k-th found one
+        candidates, distances = self.within(lat, lon, distances[k - 1], mask, exclude)
+        return candidates[:k], distances[:k]
@@ -0,0 +1,19 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FIXTURE_PATH = os.path.join(ROOT, "benchmarks", "fixtures", "tourism_sample.csv")
+
+
+# A copy of the sample extract the test may rewrite
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "source" / "tourism.csv"
+    path.parent.mkdir()
+    shutil.copy(FIXTURE_PATH, path)
+    return path
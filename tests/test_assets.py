@@ -0,0 +1,39 @@
+import io
+
+import pytest
+from PIL import Image as PILImage
+
+import assets
+
+IMAGES = {"skyline": assets.Image("https://images.invalid/skyline.jpg", "Skyline")}
+
+
+def jpeg_bytes(width=1200, height=800):
+    buffer = io.BytesIO()
+    PILImage.new("RGB", (width, height), (40, 90, 160)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def test_missing_images_are_retried_until_fetched(tmp_path, monkeypatch):
+    attempts = []
+
+    def download(url):
+        attempts.append(url)
+        if len(attempts) < 3:
+            raise OSError("host unreachable")
+        return jpeg_bytes()
+
+    monkeypatch.setattr(assets, "_download", download)
+    monkeypatch.setattr(assets, "RETRY_SECONDS", 0)
+    static_dir = tmp_path / "static"
+    manifest = assets.prepare_assets_with_retry(IMAGES, str(static_dir), str(tmp_path / "originals"), offline=False)
+
+    assert len(attempts) == 3
+    assert [width for width, _, _ in manifest["skyline"]["variants"]["webp"]] == [480, 960, 1200]
+    assert assets.read_manifest(str(static_dir)) == manifest
+
+
+def test_offline_does_not_retry(tmp_path, monkeypatch):
+    monkeypatch.setattr(assets, "_download", lambda url: pytest.fail("fetched while offline"))
+    manifest = assets.prepare_assets_with_retry(IMAGES, str(tmp_path / "static"), str(tmp_path / "originals"), offline=True)
+    assert manifest == {}
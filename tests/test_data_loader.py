@@ -0,0 +1,90 @@
+import functools
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import data_loader
+
+
+# Serves the source directory over HTTP and records the status of every response
+@pytest.fixture
+def http_source(source):
+    statuses = []
+
+    class Handler(SimpleHTTPRequestHandler):
+        def log_request(self, code='-', size='-'):
+            statuses.append(int(code))
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(Handler, directory=str(source.parent)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/{source.name}", statuses, server
+    server.shutdown()
+    server.server_close()
+
+
+def test_http_source_is_revalidated(http_source, tmp_path):
+    url, statuses, _ = http_source
+    cache_dir = tmp_path / "cache"
+
+    first = data_loader.load_dataset(url, cache_dir, offline=False)
+    assert statuses == [200]
+    assert len(first.data) == 1000
+    assert (cache_dir / f"tourism-{first.version}.parquet").exists()
+
+    # Unchanged source: a 304 answers the conditional request and nothing is reloaded
+    assert data_loader.load_dataset(url, cache_dir, offline=False, known_version=first.version) is None
+    assert statuses == [200, 304]
+
+    # A new process without the frame in memory reads it back from the snapshot
+    again = data_loader.load_dataset(url, cache_dir, offline=False)
+    assert again.version == first.version
+    assert again.data.equals(first.data)
+
+
+def test_snapshot_is_used_when_source_is_unreachable(http_source, tmp_path):
+    url, _, server = http_source
+    cache_dir = tmp_path / "cache"
+    first = data_loader.load_dataset(url, cache_dir, offline=False)
+    server.shutdown()
+    server.server_close()
+
+    fallback = data_loader.load_dataset(url, cache_dir, offline=False)
+    assert fallback.version == first.version
+    assert len(fallback.data) == len(first.data)
+
+    offline = data_loader.load_dataset(url, cache_dir, offline=True)
+    assert offline.version == first.version
+
+
+def test_unreachable_source_without_snapshot_raises(tmp_path):
+    with pytest.raises(OSError):
+        data_loader.load_dataset("http://127.0.0.1:9/tourism.csv", tmp_path / "cache", offline=False)
+    with pytest.raises(FileNotFoundError):
+        data_loader.load_dataset("http://127.0.0.1:9/tourism.csv", tmp_path / "cache", offline=True)
+
+
+def test_changed_local_file_gets_a_new_version(source, tmp_path):
+    cache_dir = tmp_path / "cache"
+    first = data_loader.load_dataset(str(source), cache_dir, offline=False)
+    assert data_loader.load_dataset(str(source), cache_dir, offline=False, known_version=first.version) is None
+
+    lines = source.read_text(encoding="utf-8").splitlines(keepends=True)
+    source.write_text("".join(lines[:-10]), encoding="utf-8")
+    second = data_loader.load_dataset(str(source), cache_dir, offline=False, known_version=first.version)
+    assert second.version != first.version
+    assert len(second.data) == len(first.data) - 10
+
+
+def test_schema_change_reloads_an_unchanged_source(http_source, tmp_path, monkeypatch):
+    url, statuses, _ = http_source
+    cache_dir = tmp_path / "cache"
+    first = data_loader.load_dataset(url, cache_dir, offline=False)
+
+    # The old manifest is not revalidated, so the body is fetched and cleaned again
+    monkeypatch.setattr(data_loader, "SCHEMA_VERSION", "test")
+    second = data_loader.load_dataset(url, cache_dir, offline=False, known_version=first.version)
+    assert statuses == [200, 200]
+    assert second.version != first.version
+    assert (cache_dir / f"tourism-{second.version}.parquet").exists()
+    assert data_loader.read_manifest(cache_dir)["schema"] == "test"
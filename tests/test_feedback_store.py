@@ -0,0 +1,30 @@
+import feedback_store
+
+
+def test_legacy_lines_with_colons_are_migrated_once(tmp_path):
+    legacy = tmp_path / "submitted_emails.txt"
+    legacy.write_text(
+        "first@example.com:Great dashboard\n"
+        "second@example.com:Note: the map is slow: please fix\n"
+        "first@example.com:a later duplicate\n"
+        "\n",
+        encoding="utf-8",
+    )
+    store = feedback_store.FeedbackStore(str(tmp_path / "feedback.db"), str(legacy))
+
+    assert store.count() == 2
+    assert store.get("first@example.com") == "Great dashboard"
+    assert store.get("second@example.com") == "Note: the map is slow: please fix"
+    assert not legacy.exists()
+    assert (tmp_path / "submitted_emails.txt.migrated").exists()
+
+    # A recreated legacy file is not imported a second time
+    legacy.write_text("third@example.com:late\n", encoding="utf-8")
+    store = feedback_store.FeedbackStore(str(tmp_path / "feedback.db"), str(legacy))
+    assert store.count() == 2
+
+
+def test_submit_keeps_the_first_feedback(tmp_path):
+    store = feedback_store.FeedbackStore(str(tmp_path / "feedback.db"), None)
+    assert store.submit("user@example.com", "one: two") == (True, None)
+    assert store.submit("user@example.com", "other") == (False, "one: two")
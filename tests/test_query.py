@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_loader
+import query
+
+from conftest import FIXTURE_PATH
+
+
+@pytest.fixture(scope="module")
+def data():
+    frame = data_loader.clean_data(pd.read_csv(FIXTURE_PATH, usecols=data_loader.is_used_column))
+    # Unanswered flags must match neither "must have" nor "must not have"
+    flag = 'Existence of cafes - does not exist'
+    frame[flag] = frame[flag].astype('Int8')
+    frame.loc[frame.index[::7], flag] = pd.NA
+    return frame
+
+
+def brute_force(data, row_filter):
+    mask = pd.Series(True, index=data.index)
+    for column in data.columns:
+        if not column.startswith(data_loader.FLAG_PREFIX):
+            continue
+        feature, exists_when_set = query.parse_flag(column)
+        is_set = data[column] == 1
+        exists = is_set if exists_when_set else data[column] == 0
+        if feature in row_filter.must_have:
+            mask &= exists.fillna(False).astype(bool)
+        if feature in row_filter.must_not_have:
+            mask &= (data[column].notna() & ~exists.fillna(False).astype(bool))
+    for column, (low, high) in row_filter.ranges.items():
+        mask &= data[column].between(low, high)
+    return mask.to_numpy()
+
+
+def test_parse_flag():
+    assert query.parse_flag('Existence of cafes - does not exist') == ('cafes', False)
+    assert query.parse_flag('Existence of initiatives and projects - exists') == ('initiatives and projects', True)
+
+
+@pytest.mark.parametrize("row_filter", [
+    query.NO_FILTER,
+    query.Filter(('hotels',), (), {}),
+    query.Filter((), ('cafes',), {}),
+    query.Filter(('hotels', 'restaurants'), ('cafes',), {}),
+    query.Filter((), (), {'Total number of restaurants': (1, 10)}),
+    query.Filter(('cafes',), (), {'Total': (0, 0), 'Total number of hotels': (2, 6)}),
+    query.Filter((), (), {'Total': (1000, 2000)}),
+])
+def test_mask_matches_brute_force(data, row_filter):
+    index = query.QueryIndex(data)
+    expected = brute_force(data, row_filter)
+    assert np.array_equal(index.mask(row_filter), expected)
+    assert index.count(row_filter) == expected.sum()
+
+
+def test_random_filters_match_brute_force(data):
+    index = query.QueryIndex(data)
+    features = list(index.features)
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        chosen = rng.permutation(features)[:rng.integers(0, 3)]
+        split = rng.integers(0, len(chosen) + 1)
+        low = int(rng.integers(0, 10))
+        row_filter = query.Filter(tuple(chosen[:split]), tuple(chosen[split:]),
+                                  {'Total': (low, low + int(rng.integers(0, 15)))})
+        assert np.array_equal(index.mask(row_filter), brute_force(data, row_filter))
+
+
+def test_filter_key_ignores_order():
+    first = query.Filter(('hotels', 'cafes'), (), {'Total': (1, 5)})
+    second = query.Filter(('cafes', 'hotels'), (), {'Total': (1, 5)})
+    assert query.filter_key(first) == query.filter_key(second)
+    assert query.filter_key(first) != query.filter_key(query.NO_FILTER)
@@ -0,0 +1,57 @@
+import os
+
+import aggregates
+import data_loader
+import refresher
+
+
+def make_refresher(source, cache_dir):
+    def load(known_version):
+        return data_loader.load_dataset(str(source), cache_dir, offline=False, known_version=known_version)
+
+    return refresher.Refresher(load, lambda dataset: aggregates.build_cube(dataset.data), interval=600)
+
+
+def test_new_version_is_published_while_old_snapshot_stays_consistent(source, tmp_path):
+    poller = make_refresher(source, tmp_path / "cache")
+    assert poller.refresh()
+    old = poller.current()
+    assert old.generation == 1
+    old_total = old.cube['Total'].sum()
+    assert old_total == old.dataset.data['Total'].sum()
+
+    # Unchanged source: nothing new is published
+    assert not poller.refresh()
+    assert poller.current() is old
+
+    lines = source.read_text(encoding="utf-8").splitlines(keepends=True)
+    source.write_text("".join(lines[:-100]), encoding="utf-8")
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert poller.refresh()
+
+    new = poller.current()
+    assert new.generation == 2
+    assert new.dataset.version != old.dataset.version
+    assert new.cube['Total'].sum() == new.dataset.data['Total'].sum() < old_total
+    # A rerun still holding the old snapshot keeps seeing the old version throughout
+    assert old.generation == 1
+    assert old.cube['Total'].sum() == old_total == old.dataset.data['Total'].sum()
+
+
+def test_failed_initial_load_is_retried_by_current():
+    attempts = []
+
+    def load(known_version):
+        attempts.append(known_version)
+        if len(attempts) == 1:
+            raise OSError("source unreachable")
+        return data_loader.Dataset("v1", None)
+
+    poller = refresher.Refresher(load, lambda dataset: "cube", interval=600)
+    poller._try_refresh()
+    poller._ready.set()
+
+    snapshot = poller.current(timeout=1)
+    assert snapshot.generation == 1
+    assert len(attempts) == 2
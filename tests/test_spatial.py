@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+import spatial
+
+
+@pytest.fixture(scope="module")
+def points():
+    rng = np.random.default_rng(1)
+    # Roughly Lebanon's extent, plus a few far away points
+    lats = np.concatenate([rng.uniform(33.0, 34.7, 2000), [40.0, -10.0]])
+    lons = np.concatenate([rng.uniform(35.0, 36.7, 2000), [20.0, 120.0]])
+    return lats, lons
+
+
+def brute_distances(points, lat, lon):
+    lats, lons = points
+    return spatial.haversine_km(lat, lon, lats, lons)
+
+
+@pytest.mark.parametrize("radius_km", [0.5, 5, 30, 150])
+def test_within_matches_brute_force(points, radius_km):
+    index = spatial.SpatialIndex(*points)
+    for lat, lon in [(33.89, 35.5), (34.43, 35.84), (33.0, 35.0)]:
+        indices, distances = index.within(lat, lon, radius_km)
+        expected = np.flatnonzero(brute_distances(points, lat, lon) <= radius_km)
+        assert set(indices.tolist()) == set(expected.tolist())
+        assert np.all(np.diff(distances) >= 0)
+
+
+@pytest.mark.parametrize("k", [1, 5, 50])
+def test_nearest_matches_brute_force(points, k):
+    index = spatial.SpatialIndex(*points)
+    mask = np.arange(len(points[0])) % 3 == 0
+    for lat, lon in [(33.89, 35.5), (34.43, 35.84), (36.0, 37.0)]:
+        distances = brute_distances(points, lat, lon)
+        indices, found = index.nearest(lat, lon, k=k)
+        assert np.allclose(found, np.sort(distances)[:k])
+
+        indices, found = index.nearest(lat, lon, k=k, mask=mask, exclude=0)
+        allowed = np.flatnonzero(mask)
+        allowed = allowed[allowed != 0]
+        assert np.all(mask[indices]) and 0 not in indices
+        assert np.allclose(found, np.sort(distances[allowed])[:k])
+
+
+def test_nearest_returns_every_point_when_k_exceeds_them(points):
+    index = spatial.SpatialIndex(points[0][:10], points[1][:10])
+    indices, _ = index.nearest(33.9, 35.5, k=25)
+    assert sorted(indices.tolist()) == list(range(10))
@@ -1,448 +1,562 @@
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-from streamlit_folium import folium_static
-import folium
-import re
-import os  # To check if the file exists
-
-# Set page configuration
-st.set_page_config(page_title="Tourism Statistics in Lebanon", page_icon="📊", layout="wide")
-
-# Add a title and description
-st.title("Tourism Statistics in Lebanon 🇱🇧")
-st.write("""
-Lebanon's tourism industry is renowned for its rich history, diverse culture, and stunning landscapes. The country offers a unique blend of historical sites, beautiful coastlines, and vibrant cities. In this dashboard, you can explore various statistics related to Lebanon's tourism sector.
-""")
-
-# Load the dataset from the URL
-path = "https://linked.aub.edu.lb/pkgcube/data/04c5f4bde28959f32bea81b9138bf5b3_20240905_163812.csv"
-data = pd.read_csv(path)
-# Drop unnecessary columns
-data.drop(columns=["publisher", "dataset", "references"], inplace=True)
-
-# Modify 'refArea' by extracting the last part after the last slash
-data['refArea'] = data['refArea'].apply(lambda x: x.split('/')[-1])
-
-# Create a sidebar for navigation
-st.sidebar.title("Navigation")
-page = st.sidebar.radio("Go to", ["Overview", "Bar Chart", "Pie Chart", "Heat Map", "Histogram", "Initiatives", "Scatter Plot", "Filtered Map", "Tourist Spots",  "Feedback"])
-
-# Function to display bar chart
-def display_bar_chart():
-    st.header("Existence of Cafes, Restaurants, and Hotels")
-
-    # Dropdown menu for selecting category
-    category = st.selectbox(
-        'Select a category to view',
-        ['Existence of cafes - does not exist', 'Existence of restaurants - does not exist', 'Existence of hotels - does not exist']
-    )
-
-    # Count occurrences for the selected category
-    category_count = data[category].value_counts().reset_index()
-    category_count.columns = ['Existence Status', 'Count']
-
-    # Create a bar plot using Plotly Express
-    fig = px.bar(category_count, x='Existence Status', y='Count', text='Count',
-                 labels={'Existence Status': 'Existence Status', 'Count': 'Count'},
-                 title=f'Existence of {category.split(" - ")[0]}')
-
-    # Update the x-axis labels
-    fig.update_xaxes(ticktext=['Does Not Exist', 'Exist'], tickvals=[0, 1])
-
-    st.plotly_chart(fig)
-
-    # Add a button to show the explanation for the bar chart
-    if st.button("Show Bar Chart Explanation"):
-      st.write("Explanation: We can see here that most of the Lebanese cities and villages have hotels (around 70%) "
-             "but only some have restaurants or cafes (around 45%).")
-
-# Function to display pie chart
-def display_pie_chart():
-    st.header("Total Number of Restaurants by Area")
-    total_restaurants_by_area = data.groupby('refArea')['Total number of restaurants'].sum().reset_index()
-
-    # Create a pie chart for total restaurants by area
-    fig = px.pie(total_restaurants_by_area, names='refArea', values='Total number of restaurants',
-                 title='Total Number of Restaurants by Area')
-
-    st.plotly_chart(fig)
-
-    if st.button("Show Pie Chart Explanation"):
-      st.write("Explanation: As shown in this pie chart, the Baabda district accounts for 11% of the total number of restaurants across all districts.")
-
-# Function to display heat map
-def display_heat_map():
-    st.header("Heat Map of Percentage of Total Numbers of Restaurants, Hotels, and Cafes")
-    aggregated_data = data.groupby('refArea')[['Total number of restaurants', 'Total number of hotels', 'Total number of cafes']].sum().reset_index()
-
-    # Calculate total numbers
-    total_numbers = aggregated_data[['Total number of restaurants', 'Total number of hotels', 'Total number of cafes']].sum()
-
-    # Calculate percentage data
-    percentage_data = aggregated_data.copy()
-    percentage_data[['Total number of restaurants', 'Total number of hotels', 'Total number of cafes']] = (
-        percentage_data[['Total number of restaurants', 'Total number of hotels', 'Total number of cafes']].div(total_numbers) * 100
-    )
-
-    # Create a heat map using Plotly Express
-    fig = px.imshow(
-        percentage_data.set_index('refArea').T,
-        labels=dict(x='Area', y='Metric', color='Percentage (%)'),
-        title='Heat Map of Percentage of Total Numbers of Restaurants, Hotels, and Cafes'
-    )
-
-    st.plotly_chart(fig)
-
-    if st.button("Show Heat Map Explanation"):
-      st.write("Explanation: The heatmap reveals interesting patterns across different districts. Baabda District stands out with a higher concentration of both restaurants and cafes. Akkar Governorate has the highest percentage of cafes compared to other regions. Meanwhile, the Mount Lebanon Governorate displays a balanced distribution of restaurants, hotels, and cafes, indicating a well-rounded offering in both dining and accommodation. ")
-
-# Function to display histogram
-def display_histogram():
-    st.header("Histogram of Existence of Initiatives and Projects")
-    hist_data = data['Existence of initiatives and projects in the past five years to improve the tourism sector - exists'].value_counts().reset_index()
-    hist_data.columns = ['Existence of Initiatives', 'Count']
-
-    # Create a bar plot using Plotly Express
-    fig = px.bar(hist_data, x='Existence of Initiatives', y='Count', text='Count',
-                 labels={'Existence of Initiatives': 'Existence of Initiatives/Projects', 'Count': 'Number of Areas'},
-                 title='Existence of Initiatives and Projects in the Last Five Years')
-
-    st.plotly_chart(fig)
-
-    if st.button("Show Histogram Explanation"):
-      st.write("Explanation: As shown in this histogram, most of the cities do not have initiatives and projects to improve the tourism sector, around 88%.")
-
-# Function to display initiatives
-def display_initiatives():
-    st.header("Tourism Initiatives in Lebanon")
-    
-    initiative_data = data['Existence of initiatives and projects in the past five years to improve the tourism sector - exists'].value_counts()
-    
-    # Display the bar chart
-    fig = px.bar(initiative_data, x=initiative_data.index, y=initiative_data.values, 
-                 labels={'x': 'Existence of Initiatives', 'y': 'Number of Areas'},
-                 title='Existence of Initiatives and Projects in the Past Five Years')
-    
-    st.plotly_chart(fig)
-
-    if st.button("Show Bar Plot Explanation"):
-      st.write("Explanation: As shown in this bar plot, Byblos district has the highest number of initiatives with 10, followed by Mount Lebanon Governorate and Baalbek-Hermel Governorate with 9.")
-
-# Function to display scatter plot
-def display_scatter_plot():
-    st.header("Total Number of Establishments per Area (Summed)")
-    df = pd.DataFrame(data)
-    df_grouped = df.groupby('refArea').sum().reset_index()
-    df_grouped['Total'] = df_grouped['Total number of restaurants'] + df_grouped['Total number of hotels'] + df_grouped['Total number of cafes']
-
-    # Create a scatter plot using Plotly Express
-    fig = px.scatter(df_grouped, 
-                     x='refArea', 
-                     y='Total', 
-                     size='Total',  
-                     color='Total',  
-                     hover_name='refArea',  
-                     text='refArea',  
-                     title='Total Number of Restaurants, Hotels, and Cafes per Area (Summed)',
-                     labels={'Total':'Total Number of Establishments', 'refArea': 'Area'},
-                     color_continuous_scale=px.colors.sequential.Plasma)
-
-    fig.update_traces(textposition='top center', marker=dict(line=dict(width=2, color='white')))
-    fig.update_layout(
-        width=1200,
-        height=800,
-        paper_bgcolor='#2e2e2e',
-        plot_bgcolor='#2e2e2e',
-        title_font=dict(size=24, family='Arial Black', color='white'),
-        xaxis_title_font=dict(size=18, family='Arial', color='white'),
-        yaxis_title_font=dict(size=18, family='Arial', color='white'),
-        legend_title_font=dict(size=16, color='white'),
-        margin=dict(l=50, r=50, t=70, b=50),
-        xaxis=dict(showgrid=False, showline=True, showticklabels=True, ticks='outside'),
-        yaxis=dict(showgrid=False, showline=True, showticklabels=True, ticks='outside')
-    )
-
-    st.plotly_chart(fig)
-
-    if st.button("Show Scatter Plot Explanation"):
-        st.write("Explanation: This scatter plot shows the total number of establishments in each area. Larger circles represent areas with more restaurants, hotels, and cafes combined.")
-
-# Define coordinates for different areas
-coordinates = {
-    'Akkar_Governorate': (34.5078, 36.1534),
-    'Mount_Lebanon_Governorate': (33.9634, 35.8347),
-    'Matn_District': (34.0280, 35.8351),
-    'Byblos_District': (34.1202, 35.6800),
-    'Baalbek-Hermel_Governorate': (33.9061, 36.1478),
-    'Aley_District': (33.8321, 35.8329),
-    'Keserwan_District': (34.0376, 35.6163),
-    'Tyre_District': (33.1615, 35.1146),
-    'South_Governorate': (33.2721, 35.2033),
-    'Sidon_District': (33.6020, 35.6924),
-    'Baabda_District': (33.8750, 35.4778),
-    'Miniyeh–Danniyeh_District': (34.2755, 35.7016),
-    'North_Governorate': (34.4186, 35.7857),
-    'Zgharta_District': (34.1564, 35.7830),
-    'Nabatieh_Governorate': (33.3641, 35.6466),
-    'Bint_Jbeil_District': (33.3638, 35.7387),
-    'Batroun_District': (34.1755, 35.7016),
-    'Zahlé_District': (33.5422, 35.8101),
-    'Western_Beqaa_District': (34.2304, 35.8682),
-    'Marjeyoun_District': (33.7500, 35.6924),
-    'Beqaa_Governorate': (34.0868, 35.9783),
-    'Bsharri_District': (34.2507, 36.0117),
-    'Hasbaya_District': (33.3979, 35.6851),
-    'Hermel_District': (34.3989, 36.3904),
-    'Tripoli_District,_Lebanon': (34.3284, 35.9783)
-}
-
-# Ensure 'data' is defined and contains the necessary columns
-# Example loading data (replace with actual data loading code):
-# data = pd.read_csv('your_data_file.csv')
-
-# Calculate total establishments
-data['Total'] = (
-    data['Total number of restaurants'].fillna(0) + 
-    data['Total number of hotels'].fillna(0) + 
-    data['Total number of cafes'].fillna(0)
-)
-
-# Aggregate data by area
-aggregated_data = data.groupby('refArea').agg({'Total': 'sum'}).reset_index()
-aggregated_data['Latitude'] = aggregated_data['refArea'].map(lambda x: coordinates.get(x, (None, None))[0])
-aggregated_data['Longitude'] = aggregated_data['refArea'].map(lambda x: coordinates.get(x, (None, None))[1])
-
-# Create map with default view
-def display_filtered_map():
-    map_center = [33.8547, 35.8623]
-    m_filtered = folium.Map(location=map_center, zoom_start=8)
-
-    def color_producer(total):
-        if total < 50:
-            return 'green'
-        elif total < 100:
-            return 'yellow'
-        elif total < 200:
-            return 'orange'
-        else:
-            return 'red'
-
-    st.write("### Filtered Map of Tourist Establishments")
-
-    # Add filter for the minimum total number of establishments
-    min_total = st.slider('Minimum Total Number of Establishments', min_value=0, max_value=int(aggregated_data['Total'].max()), value=0)
-
-    filtered_data = aggregated_data[aggregated_data['Total'] >= min_total]
-
-    for i, row in filtered_data.iterrows():
-        if pd.notna(row['Latitude']) and pd.notna(row['Longitude']):
-            folium.CircleMarker(
-                location=[row['Latitude'], row['Longitude']],
-                radius=10,
-                popup=f"{row['refArea']}: {row['Total']}",
-                color=color_producer(row['Total']),
-                fill=True,
-                fill_color=color_producer(row['Total']),
-                fill_opacity=0.6
-            ).add_to(m_filtered)
-
-    st.subheader("Filtered Map")
-    folium_static(m_filtered, width=700, height=500)
-
-    # Add explanation button
-    if st.button("Show Map Explanation"):
-        st.write("Explanation: This interactive map displays the total number of tourist establishments (restaurants, hotels, and cafes) across various areas. The colors of the markers indicate the range of the total number of establishments. You can use the slider to filter areas based on the minimum number of establishments.")
-
-
-
-# Email validation function
-def validate_email(email):
-    email_regex = r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$'
-    return re.match(email_regex, email)
-
-# Check if email is already in the file
-def check_existing_email(email):
-    if os.path.exists('submitted_emails.txt'):
-        with open('submitted_emails.txt', 'r') as file:
-            for line in file:
-                try:
-                    # Attempt to split the line by the colon separator
-                    saved_email, saved_feedback = line.strip().split(':')
-                    if saved_email == email:
-                        return True, saved_feedback
-                except ValueError:
-                    # Skip lines that don't follow the email:feedback format
-                    continue
-    return False, None
-
-# Save email and feedback to the file
-def save_email_feedback(email, feedback):
-    with open('submitted_emails.txt', 'a') as file:
-        file.write(f"{email}:{feedback}\n")
-
-# Function for feedback submission
-def display_feedback_form():
-    st.header("Feedback Form")
-
-    # Get user's email
-    email = st.text_input("Enter your email:")
-    feedback = st.text_area("Write your feedback:")
-
-    if st.button("Submit Feedback"):
-        # Validate email format
-        if not validate_email(email):
-            st.error("Invalid email format. Please enter a valid email.")
-        else:
-            # Check if email already exists
-            exists, existing_feedback = check_existing_email(email)
-            if exists:
-                st.warning("You have already submitted feedback.")
-                st.write(f"Your previous feedback: {existing_feedback}")
-            else:
-                # Save email and feedback
-                save_email_feedback(email, feedback)
-                st.success("Thank you for your feedback!")
-
-# Function to display insights and tourist recommendations
-def display_tourist_spots():
-    st.header("Tourist Spots and Insights")
-
-    # Dropdown menu for selecting a district
-    selected_district = st.selectbox('Select a district to view tourist spots and insights', options=aggregated_data['refArea'].unique())
-
-    if selected_district:
-        # Filter data for the selected district
-        district_data = aggregated_data[aggregated_data['refArea'] == selected_district]
-        
-        if not district_data.empty:
-            latitude, longitude = district_data.iloc[0]['Latitude'], district_data.iloc[0]['Longitude']
-            
-            # Show insights about the district
-            st.write(f"### Insights for {selected_district}")
-            st.write(f"- **Total Number of Establishments:** {district_data.iloc[0]['Total']}")
-            
-            # Create a map centered on the selected district
-            map_center = [latitude, longitude]
-            m_district = folium.Map(location=map_center, zoom_start=12)
-            
-            folium.Marker(
-                location=map_center,
-                popup=f"{selected_district}: {district_data.iloc[0]['Total']} establishments",
-                icon=folium.Icon(color='blue', icon='info-sign')
-            ).add_to(m_district)
-            
-            st.subheader("Map")
-            folium_static(m_district, width=700, height=500)
-            
-            # Tourist recommendations (customize based on actual data or a list of recommendations)
-            st.write("### Recommended Tourist Spots")
-            # Example recommendations for different districts (customize these as needed)
-            recommendations = {
-    'Akkar_Governorate': ["Akkar Plains", "Mkaibeh Village", "Akkar Castle"],
-    'Aley_District': ["Aley Souks", "Beirut River Valley", "Aley Forest"],
-    'Baabda_District': ["Baabda Palace", "Chouf Cedars", "Deir el Qamar"],
-    'Baalbek-Hermel_Governorate': ["Baalbek Ruins", "Zahle", "Qasr el Heri"],
-    'Batroun_District': ["Batroun Old Town", "Roman Baths", "Batroun Beaches"],
-    'Beqaa_Governorate': ["Anjar Ruins", "Baalbek Temples", "Karaoun Lake"],
-    'Bint_Jbeil_District': ["Bint Jbeil Heritage", "Mleeta Resistance Museum", "Tyre Beach"],
-    'Bsharri_District': ["Qadisha Valley", "Cedars of God", "Bsharri Museum"],
-    'Byblos_District': ["Byblos Castle", "Old Souk", "Jeita Grotto"],
-    'Hasbaya_District': ["Hasbaya Castle", "Hasbaya Souk", "Ras El Ain"],
-    'Hermel_District': ["Hermel Ruins", "Lebanon River", "Mount Hermon"],
-    'Keserwan_District': ["Jounieh Bay", "Harissa", "Faqra Ruins"],
-    'Marjeyoun_District': ["Marjeyoun Castle", "Ajloun Nature Reserve", "The Ruins of Qasr el-Ma"],
-    'Matn_District': ["Broummana", "Jdita Village", "Matn Souk"],
-    'Miniyeh–Danniyeh_District': ["Miniyeh Old Town", "Danniyeh Mountains", "Saint Georges Monastery"],
-    'Mount_Lebanon_Governorate': ["Jounieh Bay", "Harissa", "Faqra Ruins"],
-    'Nabatieh_Governorate': ["Nabatieh Souk", "Berkayel", "Jezzine Waterfalls"],
-    'North_Governorate': ["Tripoli Citadel", "Abou Ali River", "El Mina"],
-    'Sidon_District': ["Sidon Sea Castle", "Ancient Sidon", "Sidon Souks"],
-    'South_Governorate': ["Tyre Roman Ruins", "Jezzine Waterfalls", "Nabatieh Souk"],
-    'Tripoli_District_Lebanon': ["Tripoli Citadel", "Old Tripoli", "Al-Mina Port"],
-    'Tyre_District': ["Tyre Roman Ruins", "Tyre Beach", "Tyre Souks"],
-    'Western_Beqaa_District': ["Baalbek Ruins", "Taanayel Lake", "Shedra"],
-    'Zahlé_District': ["Zahlé River", "Zahlé Cathedral", "Wine Tours"],
-    'Zgharta_District': ["Zgharta Old Town", "Mar Abda Monastery", "Qozhaya Monastery"]
-}
-            if selected_district in recommendations:
-                for spot in recommendations[selected_district]:
-                    st.write(f"- {spot}")
-            else:
-                st.write("No specific recommendations available for this district.")
-
-
-
-# Display selected page
-if page == "Overview":
-    st.subheader("Explore Lebanon's Tourism")
-    st.header("Discover Lebanon")
-
-    # Add some images
-    st.image("https://t3.ftcdn.net/jpg/03/87/74/80/360_F_387748004_MxWTt4uHfVVQ59LpqgXHMP4pomczFqQS.jpg", 
-             caption="Beirut Skyline", use_column_width=True)
-
-    st.write("""
-    Lebanon's capital, Beirut, is a bustling metropolis known for its lively nightlife, historical landmarks, and beautiful Mediterranean coastline.
-    """)
-
-    st.image("https://www.new7wonders.com/app/uploads/sites/4/2016/09/16527177602_ff18053a91_o.jpg",
-             caption="Jeita Grotto", use_column_width=True)
-
-    st.write("""
-    The Jeita Grotto is a stunning natural wonder, featuring impressive limestone caves and underground rivers that attract visitors from all over the world.
-    """)
-
-    st.image("http://lebanonuntravelled.com/wp/wp-content/uploads/2023/05/photo_5965516417036041360_y-1.jpg",
-             caption="Byblos Old Souk", use_column_width=True)
-
-    st.write("""
-    Byblos is one of the oldest continuously inhabited cities in the world. Its ancient ruins and traditional markets are a testament to Lebanon's rich cultural heritage.
-    """)
-    st.write("""
-- **Annual Tourist Arrivals:** Lebanon attracts millions of tourists each year, with significant contributions from countries such as Saudi Arabia, UAE, France, and the USA. The country's strategic location and historical significance make it a popular destination in the Middle East.
-
-- **Tourism Revenue:** The tourism sector plays a crucial role in Lebanon's economy, contributing significantly to the country's GDP. The influx of international visitors supports a wide range of industries including hospitality, transportation, and local crafts.
-
-- **Popular Attractions:**
-  - **Beirut:** Known for its vibrant nightlife, cultural events, and historical landmarks. Key spots include the Corniche, the National Museum, and the iconic Pigeon Rocks.
-  - **Jeita Grotto:** A natural wonder featuring impressive cave formations and subterranean rivers. It is a finalist in the New7Wonders of Nature.
-  - **Byblos:** An ancient city with historical ruins and a bustling souk. The Byblos Castle and the ancient port are key attractions.
-  - **Baalbek:** Famous for its Roman temples, including the Temple of Jupiter, Temple of Bacchus, and the Temple of Venus. It is a UNESCO World Heritage site.
-  - **Lebanese Mountains:** Offering picturesque landscapes and outdoor activities. Popular areas include Mount Lebanon and the Cedars of God.
-
-- **Tourist Demographics:** Visitors to Lebanon come from diverse backgrounds, with significant numbers from neighboring Arab countries as well as Western nations. The country’s historical sites, natural beauty, and cultural experiences attract a wide range of tourists.
-
-- **Tourism Infrastructure:** Lebanon boasts a well-developed tourism infrastructure, including luxury hotels, resorts, and restaurants. The country is also known for its high-quality service and hospitality.
-
-- **Cultural Events and Festivals:** Lebanon hosts numerous cultural events and festivals throughout the year, including music festivals, food festivals, and traditional celebrations. These events draw both local and international tourists.
-
-- **Economic Impact:** Tourism is a major source of foreign exchange for Lebanon and provides employment opportunities across various sectors. The industry also promotes local businesses and crafts, contributing to the country's economic development.
-""")
-elif page == "Bar Chart":
-    display_bar_chart()
-
-elif page == "Pie Chart":
-    display_pie_chart()
-
-elif page == "Heat Map":
-    display_heat_map()
-
-elif page == "Histogram":
-    display_histogram()
-
-elif page == "Initiatives":
-    display_initiatives()
-
-elif page == "Scatter Plot":
-    display_scatter_plot()
-
-elif page == "Filtered Map":
-    display_filtered_map()
-
-elif page == "Tourist Spots":
-    display_tourist_spots()
-
-# Add feedback form
-elif page == "Feedback":
-    display_feedback_form()
\ No newline at end of file
+import streamlit as st
+import re
+import importlib
+import functools
+import json
+from collections import namedtuple
+import logging
+import settings
+import figure_cache
+import metrics
+
+# Heavy modules (pandas, plotly, folium) are imported inside the page functions that need
+# them, so a rerun only loads what its page uses
+
+# Set page configuration
+st.set_page_config(page_title="Tourism Statistics in Lebanon", page_icon="📊", layout="wide")
+
+# Add a title and description
+st.title("Tourism Statistics in Lebanon 🇱🇧")
+st.write("""
+Lebanon's tourism industry is renowned for its rich history, diverse culture, and stunning landscapes. The country offers a unique blend of historical sites, beautiful coastlines, and vibrant cities. In this dashboard, you can explore various statistics related to Lebanon's tourism sector.
+""")
+
+# Timing spans, rerun counters and the /metrics endpoint, shared by all sessions
+@st.cache_resource
+def get_metrics():
+    registry = metrics.Metrics()
+    if settings.SPAN_LOGS:
+        metrics.configure_logging()
+    if settings.METRICS_PORT:
+        try:
+            metrics.start_server(registry, int(settings.METRICS_PORT), settings.METRICS_HOST, settings.METRICS_PORTS)
+        except OSError as error:
+            logging.getLogger(__name__).warning("Metrics endpoint not started on ports %s-%s: %s", settings.METRICS_PORT,
+                                                int(settings.METRICS_PORT) + settings.METRICS_PORTS - 1, error)
+    return registry
+
+# Background thread polling the source and swapping in new versions, shared by all sessions
+@st.cache_resource
+def get_refresher():
+    import pipeline
+    import refresher
+    registry = get_metrics()
+
+    def load_source(known_version):
+        with registry.span("data_load"):
+            return pipeline.load_source(known_version)
+
+    def prepare_cube(dataset):
+        with registry.span("aggregation"):
+            return pipeline.prepare_cube(dataset)
+
+    load, prepare = load_source, prepare_cube
+    # With a shared directory only one server process loads and prepares each version;
+    # every process memory-maps the published files instead of parsing the source
+    if settings.SHARED_DIR:
+        import shared_dataset
+
+        def load(known_version):
+            return shared_dataset.sync(load_source, prepare_cube, known_version)
+
+        prepare = shared_dataset.attach_cube
+
+    poller = refresher.Refresher(load, prepare, settings.REVALIDATE_SECONDS).start()
+    registry.add_collector(lambda: [("tourism_dataset_generation", {}, poller.generation)])
+    return poller
+
+# The snapshot a rerun works on; taken once so the whole page sees a single version
+def current_snapshot():
+    poller = get_refresher()
+    if poller.generation == 0:
+        with st.spinner("Loading tourism data..."):
+            return poller.current()
+    return poller.current()
+
+# Cache of serialized figures shared by all sessions; reruns with unchanged data and
+# widget values skip rebuilding the figure
+@st.cache_resource
+def get_figure_cache():
+    cache = figure_cache.FigureCache()
+    get_metrics().add_collector(
+        lambda: [(f"tourism_figure_cache_{name}", {}, value) for name, value in cache.stats().items()]
+    )
+    return cache
+
+def show_figure(page, build, dataset, cube, **widgets):
+    import plotly.graph_objects as go
+
+    def build_figure():
+        with get_metrics().span("figure_build"):
+            return build(cube, **widgets)
+
+    key = figure_cache.FigureCache.make_key(page, dataset.version, **widgets)
+    payload = get_figure_cache().get_or_build(key, build_figure)
+    with get_metrics().span("figure_render"):
+        # The payload was validated when it was built; a Figure (unlike a dict) is not
+        # validated again by st.plotly_chart
+        st.plotly_chart(go.Figure(json.loads(payload), _validate=False))
+
+# Label the spans of this rerun with its page, session and kind ("full" or "fragment"), and
+# count the rerun
+def bind_rerun(name, kind="full"):
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    registry = get_metrics()
+    ctx = get_script_run_ctx()
+    registry.bind(page=name, session=ctx.session_id if ctx else "", kind=kind)
+    registry.increment("tourism_reruns_total", page=name, kind=kind)
+    st.session_state["rendered_page"] = name
+    return registry
+
+# Parts of a page that own a widget run as fragments: interacting with the widget reruns
+# only that function, with the arguments of the last full run, instead of the whole script
+def fragment(func):
+    if not settings.FRAGMENTS:
+        return func
+
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        registry = get_metrics()
+        ctx = get_script_run_ctx()
+        if ctx is not None and ctx.fragment_ids_this_run:
+            # A fragment rerun skips render_page and runs on a fresh thread: label and count
+            # it for the page the session last rendered
+            bind_rerun(st.session_state.get("rendered_page", ""), kind="fragment")
+        with registry.span(f"fragment_{func.__name__}"):
+            return func(*args, **kwargs)
+    return st.fragment(timed)
+
+# Explanation button of a chart or map; once shown, the explanation stays open for the
+# session until the button is clicked again
+@fragment
+def explanation(label, text):
+    key = f"explanation_{label}"
+    if st.button(label):
+        st.session_state[key] = not st.session_state.get(key, False)
+    if st.session_state.get(key):
+        st.write(text)
+
+# Overview images are served from local variants (see assets.py); the first use starts
+# preparing any missing ones in the background, so the page never waits on the image hosts.
+# Images whose host is unreachable are retried there until they are available.
+@st.cache_resource
+def get_image_assets():
+    import threading
+    import assets
+    threading.Thread(target=assets.prepare_assets_with_retry, name="image-assets", daemon=True).start()
+    return assets
+
+def show_image(name, eager=False):
+    assets = get_image_assets()
+    image = assets.IMAGES[name]
+    entry = assets.read_manifest().get(name)
+    if entry is None:
+        # Not prepared yet, or the host is unreachable: keep the caption in the image's place
+        st.caption(image.caption)
+    else:
+        st.html(assets.picture_html(entry, image.caption, eager))
+
+# Function to display the overview
+def display_overview():
+    st.subheader("Explore Lebanon's Tourism")
+    st.header("Discover Lebanon")
+
+    # Add some images
+    show_image("beirut-skyline", eager=True)
+
+    st.write("""
+    Lebanon's capital, Beirut, is a bustling metropolis known for its lively nightlife, historical landmarks, and beautiful Mediterranean coastline.
+    """)
+
+    show_image("jeita-grotto")
+
+    st.write("""
+    The Jeita Grotto is a stunning natural wonder, featuring impressive limestone caves and underground rivers that attract visitors from all over the world.
+    """)
+
+    show_image("byblos-old-souk")
+
+    st.write("""
+    Byblos is one of the oldest continuously inhabited cities in the world. Its ancient ruins and traditional markets are a testament to Lebanon's rich cultural heritage.
+    """)
+    st.write("""
+- **Annual Tourist Arrivals:** Lebanon attracts millions of tourists each year, with significant contributions from countries such as Saudi Arabia, UAE, France, and the USA. The country's strategic location and historical significance make it a popular destination in the Middle East.
+
+- **Tourism Revenue:** The tourism sector plays a crucial role in Lebanon's economy, contributing significantly to the country's GDP. The influx of international visitors supports a wide range of industries including hospitality, transportation, and local crafts.
+
+- **Popular Attractions:**
+  - **Beirut:** Known for its vibrant nightlife, cultural events, and historical landmarks. Key spots include the Corniche, the National Museum, and the iconic Pigeon Rocks.
+  - **Jeita Grotto:** A natural wonder featuring impressive cave formations and subterranean rivers. It is a finalist in the New7Wonders of Nature.
+  - **Byblos:** An ancient city with historical ruins and a bustling souk. The Byblos Castle and the ancient port are key attractions.
+  - **Baalbek:** Famous for its Roman temples, including the Temple of Jupiter, Temple of Bacchus, and the Temple of Venus. It is a UNESCO World Heritage site.
+  - **Lebanese Mountains:** Offering picturesque landscapes and outdoor activities. Popular areas include Mount Lebanon and the Cedars of God.
+
+- **Tourist Demographics:** Visitors to Lebanon come from diverse backgrounds, with significant numbers from neighboring Arab countries as well as Western nations. The country’s historical sites, natural beauty, and cultural experiences attract a wide range of tourists.
+
+- **Tourism Infrastructure:** Lebanon boasts a well-developed tourism infrastructure, including luxury hotels, resorts, and restaurants. The country is also known for its high-quality service and hospitality.
+
+- **Cultural Events and Festivals:** Lebanon hosts numerous cultural events and festivals throughout the year, including music festivals, food festivals, and traditional celebrations. These events draw both local and international tourists.
+
+- **Economic Impact:** Tourism is a major source of foreign exchange for Lebanon and provides employment opportunities across various sectors. The industry also promotes local businesses and crafts, contributing to the country's economic development.
+""")
+
+# Function to display bar chart
+def display_bar_chart(dataset, cube):
+    st.header("Existence of Cafes, Restaurants, and Hotels")
+
+    category_chart(dataset, cube)
+
+    # Add a button to show the explanation for the bar chart
+    explanation("Show Bar Chart Explanation",
+                "Explanation: We can see here that most of the Lebanese cities and villages have hotels (around 70%) "
+                "but only some have restaurants or cafes (around 45%).")
+
+# Category picker and bar chart; changing the category only reruns this fragment
+@fragment
+def category_chart(dataset, cube):
+    import charts
+
+    # Dropdown menu for selecting category
+    category = st.selectbox(
+        'Select a category to view',
+        charts.BAR_CATEGORIES
+    )
+
+    show_figure("Bar Chart", charts.bar_chart, dataset, cube, category=category)
+
+# Function to display pie chart
+def display_pie_chart(dataset, cube):
+    import charts
+    st.header("Total Number of Restaurants by Area")
+
+    show_figure("Pie Chart", charts.pie_chart, dataset, cube)
+
+    explanation("Show Pie Chart Explanation",
+                "Explanation: As shown in this pie chart, the Baabda district accounts for 11% of the total number of restaurants across all districts.")
+
+# Function to display heat map
+def display_heat_map(dataset, cube):
+    import charts
+    st.header("Heat Map of Percentage of Total Numbers of Restaurants, Hotels, and Cafes")
+
+    show_figure("Heat Map", charts.heat_map, dataset, cube)
+
+    explanation("Show Heat Map Explanation",
+                "Explanation: The heatmap reveals interesting patterns across different districts. Baabda District stands out with a higher concentration of both restaurants and cafes. Akkar Governorate has the highest percentage of cafes compared to other regions. Meanwhile, the Mount Lebanon Governorate displays a balanced distribution of restaurants, hotels, and cafes, indicating a well-rounded offering in both dining and accommodation. ")
+
+# Function to display histogram
+def display_histogram(dataset, cube):
+    import charts
+    st.header("Histogram of Existence of Initiatives and Projects")
+
+    show_figure("Histogram", charts.histogram, dataset, cube)
+
+    explanation("Show Histogram Explanation",
+                "Explanation: As shown in this histogram, most of the cities do not have initiatives and projects to improve the tourism sector, around 88%.")
+
+# Function to display initiatives
+def display_initiatives(dataset, cube):
+    import charts
+    st.header("Tourism Initiatives in Lebanon")
+
+    show_figure("Initiatives", charts.initiatives_chart, dataset, cube)
+
+    explanation("Show Bar Plot Explanation",
+                "Explanation: As shown in this bar plot, Byblos district has the highest number of initiatives with 10, followed by Mount Lebanon Governorate and Baalbek-Hermel Governorate with 9.")
+
+# Function to display scatter plot
+def display_scatter_plot(dataset, cube):
+    import charts
+    st.header("Total Number of Establishments per Area (Summed)")
+
+    show_figure("Scatter Plot", charts.scatter_plot, dataset, cube)
+
+    explanation("Show Scatter Plot Explanation",
+                "Explanation: This scatter plot shows the total number of establishments in each area. Larger circles represent areas with more restaurants, hotels, and cafes combined.")
+
+# Base map with every area as a GeoJSON point, rendered once per dataset version or filtered
+# view; the views of the recent filters are kept, like their cubes (see get_filtered_cube)
+@st.cache_resource(show_spinner=False, max_entries=32)
+def get_map_document(version, _cube):
+    import map_layer
+    with get_metrics().span("map_build"):
+        return map_layer.build_map_document(map_layer.feature_collection(_cube))
+
+# Embed a self-contained HTML document; st.iframe replaces st.components.v1.html, which
+# newer Streamlit releases remove
+def show_document(document, width, height):
+    if hasattr(st, "iframe"):
+        st.iframe(document, width=width, height=height)
+    else:
+        import streamlit.components.v1 as components
+        components.html(document, width=width, height=height)
+
+# The map with its minimum-total slider; the slider is part of the map document and
+# filters the markers in the browser, so moving it does not rerun the script
+def filtered_map(dataset, cube):
+    import map_layer
+
+    # A filtered view may only have areas without any establishments, leaving nothing to
+    # filter by
+    if int(cube['Total'].max()) == 0:
+        st.info("No area in this view has any establishments.")
+
+    # The map document is rendered once per dataset version or filtered view
+    document = get_map_document(dataset.version, cube)
+
+    st.subheader("Filtered Map")
+    with get_metrics().span("map_render"):
+        show_document(map_layer.render_filtered_map(document, 0), width=700, height=500)
+
+# Create map with default view
+def display_filtered_map(dataset, cube):
+    st.write("### Filtered Map of Tourist Establishments")
+
+    filtered_map(dataset, cube)
+
+    # Add explanation button
+    explanation("Show Map Explanation",
+                "Explanation: This interactive map displays the total number of tourist establishments (restaurants, hotels, and cafes) across various areas. The colors of the markers indicate the range of the total number of establishments. You can use the slider on the map to filter areas based on the minimum number of establishments.")
+
+# Email validation function
+def validate_email(email):
+    email_regex = r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$'
+    return re.match(email_regex, email)
+
+# Feedback store shared by all sessions; imports submitted_emails.txt on first use
+@st.cache_resource
+def get_feedback_store():
+    import feedback_store
+    return feedback_store.FeedbackStore()
+
+# Function for feedback submission
+def display_feedback_form():
+    st.header("Feedback Form")
+
+    feedback_form()
+
+# Typing and submitting only rerun the form
+@fragment
+def feedback_form():
+    # Get user's email
+    email = st.text_input("Enter your email:")
+    feedback = st.text_area("Write your feedback:")
+
+    if st.button("Submit Feedback"):
+        # Validate email format
+        if not validate_email(email):
+            st.error("Invalid email format. Please enter a valid email.")
+        else:
+            # Save email and feedback unless this email already submitted some
+            saved, existing_feedback = get_feedback_store().submit(email, feedback)
+            if not saved:
+                st.warning("You have already submitted feedback.")
+                st.write(f"Your previous feedback: {existing_feedback}")
+            else:
+                st.success("Thank you for your feedback!")
+
+# Function to display insights and tourist recommendations
+# Spatial index over the located areas, built once per dataset version or filtered view
+@st.cache_resource(show_spinner=False, max_entries=32)
+def get_spatial_index(version, _cube):
+    import spatial
+    located = _cube.dropna(subset=['Latitude', 'Longitude']).reset_index(drop=True)
+    return located, spatial.SpatialIndex(located['Latitude'], located['Longitude'])
+
+# Table of areas found by a spatial query
+def nearby_table(located, indices, distances):
+    import pandas as pd
+    return pd.DataFrame({
+        'Area': located['refArea'].to_numpy()[indices],
+        'Distance (km)': distances.round(1),
+        'Total Number of Establishments': located['Total'].to_numpy()[indices],
+    })
+
+# Nearby-area queries for a district; their widgets only rerun this fragment
+@fragment
+def nearby_areas(dataset, cube, district, latitude, longitude):
+    import numpy as np
+
+    located, index = get_spatial_index(dataset.version, cube)
+    own = np.flatnonzero(located['refArea'].to_numpy() == district)
+    if not len(own):
+        return
+    st.write("### Nearby Areas")
+    radius_km = st.slider('Show areas within (km)', min_value=5, max_value=150, value=30, step=5)
+    indices, distances = index.within(latitude, longitude, radius_km, exclude=own[0])
+    st.dataframe(nearby_table(located, indices, distances), hide_index=True)
+
+    min_establishments = st.number_input('Nearest districts with more than this many establishments', min_value=0, value=100, step=10)
+    mask = located['Total'].to_numpy() > min_establishments
+    indices, distances = index.nearest(latitude, longitude, k=5, mask=mask, exclude=own[0])
+    st.dataframe(nearby_table(located, indices, distances), hide_index=True)
+
+def display_tourist_spots(dataset, cube):
+    from streamlit_folium import folium_static
+    import map_layer
+    import areas
+
+    st.header("Tourist Spots and Insights")
+
+    # Dropdown menu for selecting a district
+    selected_district = st.selectbox('Select a district to view tourist spots and insights', options=cube['refArea'].unique())
+
+    if selected_district:
+        # Filter data for the selected district
+        district_data = cube[cube['refArea'] == selected_district]
+        
+        if not district_data.empty:
+            latitude, longitude = district_data.iloc[0]['Latitude'], district_data.iloc[0]['Longitude']
+            
+            # Show insights about the district
+            st.write(f"### Insights for {selected_district}")
+            st.write(f"- **Total Number of Establishments:** {district_data.iloc[0]['Total']}")
+            
+            # Create a map centered on the selected district
+            m_district = map_layer.district_map(selected_district, latitude, longitude, district_data.iloc[0]['Total'])
+            
+            st.subheader("Map")
+            with get_metrics().span("map_render"):
+                folium_static(m_district, width=700, height=500)
+            
+            # Areas around the selected district, answered from the spatial index
+            nearby_areas(dataset, cube, selected_district, latitude, longitude)
+
+            # Tourist recommendations (customize based on actual data or a list of recommendations)
+            st.write("### Recommended Tourist Spots")
+            recommended = areas.lookup_recommendations(selected_district)
+            if recommended:
+                for spot in recommended:
+                    st.write(f"- {spot}")
+            else:
+                st.write("No specific recommendations available for this district.")
+
+    # Areas whose names don't match the coordinates or recommendations lists
+    unresolved = areas.unresolved_areas(cube['refArea'])
+    if unresolved['coordinates'] or unresolved['recommendations']:
+        with st.expander("Unresolved area names"):
+            st.write(f"- **Without coordinates:** {', '.join(unresolved['coordinates']) or 'none'}")
+            st.write(f"- **Without recommendations:** {', '.join(unresolved['recommendations']) or 'none'}")
+
+# Page registry: each page declares the data it needs (fields of the current snapshot), so
+# the dataset is only loaded the first time a page that uses it is visited. The heavy
+# modules a page uses are imported by its own functions.
+Page = namedtuple("Page", ["render", "needs"])
+
+PAGES = {
+    "Overview": Page(display_overview, ()),
+    "Bar Chart": Page(display_bar_chart, ("dataset", "cube")),
+    "Pie Chart": Page(display_pie_chart, ("dataset", "cube")),
+    "Heat Map": Page(display_heat_map, ("dataset", "cube")),
+    "Histogram": Page(display_histogram, ("dataset", "cube")),
+    "Initiatives": Page(display_initiatives, ("dataset", "cube")),
+    "Scatter Plot": Page(display_scatter_plot, ("dataset", "cube")),
+    "Filtered Map": Page(display_filtered_map, ("dataset", "cube")),
+    "Tourist Spots": Page(display_tourist_spots, ("dataset", "cube")),
+    "Feedback": Page(display_feedback_form, ()),
+}
+
+# Bitmap and sorted indexes over the rows of a dataset version, for the sidebar filter;
+# only the current version and the one sessions may still hold during a swap are kept
+@st.cache_resource(show_spinner=False, max_entries=2)
+def get_query_index(version, _data):
+    import query
+    with get_metrics().span("query_index"):
+        return query.QueryIndex(_data)
+
+# Cube for one filter of a dataset version; the recent filters are kept for all sessions
+@st.cache_resource(show_spinner=False, max_entries=32)
+def get_filtered_cube(version, key, _dataset, _index, _row_filter):
+    import pipeline
+    with get_metrics().span("aggregation"):
+        return pipeline.filtered_cube(_dataset, _index.mask(_row_filter))
+
+# Global filter in the sidebar, combining features areas must or must not have with
+# ranges on the counts; returns the Filter the user picked
+def sidebar_filter(index):
+    import query
+
+    features = list(index.features)
+    with st.sidebar.expander("Filter rows"):
+        must_have = st.multiselect("Must have", features, key="filter_must_have")
+        must_not_have = st.multiselect("Must not have", [feature for feature in features if feature not in must_have],
+                                       key="filter_must_not_have")
+        ranges = {}
+        for column in index.counts:
+            low, high = index.bounds(column)
+            if low < high:
+                selected = st.slider(column, low, high, (low, high), key=f"filter_{column}")
+                if selected != (low, high):
+                    ranges[column] = selected
+    return query.Filter(tuple(must_have), tuple(must_not_have), ranges)
+
+# The dataset and cube a page shows: the whole snapshot, or the cube over the rows matching
+# the sidebar filter. A filtered view gets its own version (the dataset version plus the
+# filter key), so the figure, map and spatial caches keep one entry per filter.
+def filtered_view(dataset, cube):
+    import query
+
+    if dataset.data is None:
+        # Datasets ingested from several extracts only keep the per-area aggregates
+        st.sidebar.caption("Filtering needs the row-level dataset.")
+        return dataset, cube
+
+    index = get_query_index(dataset.version, dataset.data)
+    row_filter = sidebar_filter(index)
+    if query.is_empty(row_filter):
+        return dataset, cube
+
+    matched = index.count(row_filter)
+    st.sidebar.caption(f"{matched:,} of {index.rows:,} rows match")
+    if not matched:
+        st.warning("No rows match the filter.")
+        st.stop()
+    key = query.filter_key(row_filter)
+    view = dataset._replace(version=f"{dataset.version}-{key}", data=None)
+    return view, get_filtered_cube(dataset.version, key, dataset, index, row_filter)
+
+def load_page(name):
+    if not PAGES[name].needs:
+        return {}
+    snapshot = current_snapshot()
+    return {need: getattr(snapshot, need) for need in PAGES[name].needs}
+
+def render_page(name):
+    registry = bind_rerun(name)
+    with registry.span("page"):
+        view = load_page(name)
+        if "cube" in view:
+            view["dataset"], view["cube"] = filtered_view(view["dataset"], view["cube"])
+        PAGES[name].render(**view)
+
+# Open the app with ?profile=1 (when TOURISM_ALLOW_PROFILING=1) to profile a single rerun
+def render_page_profiled(name):
+    del st.query_params["profile"]
+    with metrics.profile(settings.PROFILE_DIR, name) as result:
+        render_page(name)
+    with st.sidebar.expander("Profile of this rerun"):
+        st.caption(result['path'])
+        st.code(metrics.top_functions(result['path']))
+
+# Load everything up front, as the app did before the registry (for startup comparisons):
+# the libraries it imported at the top and the data of every page
+EAGER_MODULES = ("pandas", "plotly.express", "folium", "streamlit_folium")
+
+if settings.EAGER_IMPORTS:
+    for module in EAGER_MODULES:
+        importlib.import_module(module)
+    for name in PAGES:
+        load_page(name)
+
+# Create a sidebar for navigation
+st.sidebar.title("Navigation")
+page = st.sidebar.radio("Go to", list(PAGES))
+
+# Display selected page
+if settings.ALLOW_PROFILING and st.query_params.get("profile") == "1":
+    render_page_profiled(page)
+else:
+    render_page(page)